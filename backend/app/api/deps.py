@@ -1,13 +1,39 @@
 """Common dependencies used across API routers."""
 
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.app.db.session import get_session
+from backend.app.core.timing import timed
+from backend.app.db.session import get_async_session, get_session
 
 
 def get_db() -> Generator[Session, None, None]:
     """Expose the SQLAlchemy session as a dependency."""
 
-    yield from get_session()
+    sessions = get_session()
+    with timed("db"):
+        session = next(sessions)
+    try:
+        yield session
+    finally:
+        with timed("db"):
+            sessions.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Expose the asyncio SQLAlchemy session as a dependency.
+
+    Opening and closing the session (which returns its connection to the
+    pool) is timed as the request's ``db`` phase.
+    """
+
+    sessions = get_async_session()
+    with timed("db"):
+        session = await sessions.__anext__()
+    try:
+        yield session
+    finally:
+        with timed("db"):
+            await sessions.aclose()
@@ -1,24 +1,33 @@
 """Authentication API router."""
 
+import hashlib
+import logging
 import secrets
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.api.deps import get_db
+from backend.app.api.deps import get_async_db
 from backend.app.core.config import get_settings
-from backend.app.core.security import (
-    create_access_token,
-    get_password_hash,
-    verify_password,
-)
-from backend.app.dependencies.auth import get_current_user
+from backend.app.core.hashing import get_password_hasher
+from backend.app.core.prometheus import record_auth_event
+from backend.app.core.security import create_access_token, decode_token
+from backend.app.db.query_counter import query_budget
+from backend.app.dependencies.auth import get_current_user_async
+from backend.app.dependencies.rate_limit import client_ip, login_identity, rate_limit
 from backend.app.models.user import User
 from backend.app.schemas.auth import LoginRequest
 from backend.app.schemas.user import UserCreate, UserRead
+from backend.app.services.refresh_tokens import (
+    RefreshTokenRejectedError,
+    get_refresh_token_store,
+)
+from backend.app.services.user_cache import UserSnapshot
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -36,13 +45,16 @@ def _cookie_options(*, http_only: bool) -> dict:
     return options
 
 
-def _issue_tokens(user: User) -> tuple[str, str, int, int]:
+def _issue_tokens(user: User, *, family: str, jti: str) -> tuple[str, str, int, int]:
     settings = get_settings()
     access_delta = timedelta(minutes=settings.access_token_expire_minutes)
     refresh_delta = timedelta(days=settings.refresh_token_expire_days)
     access_token = create_access_token(user.id, expires_delta=access_delta)
     refresh_token = create_access_token(
-        user.id, expires_delta=refresh_delta, token_type="refresh"
+        user.id,
+        expires_delta=refresh_delta,
+        token_type="refresh",
+        additional_claims={"fid": family, "jti": jti},
     )
     return (
         access_token,
@@ -100,27 +112,57 @@ def _clear_auth_cookies(response: Response) -> None:
     response.delete_cookie(settings.csrf_cookie_name, **delete_kwargs)
 
 
-def _get_user_by_email(db: Session, email: str) -> User | None:
+def _refresh_rejected(detail: str, outcome: str = "rejected") -> HTTPException:
+    record_auth_event("refresh", outcome)
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+def _refresh_family(request: Request, user_id: int) -> str | None:
+    """Return the family of the request's refresh token if it belongs to ``user_id``."""
+
+    refresh_token = request.cookies.get(get_settings().refresh_token_cookie_name)
+    if not refresh_token:
+        return None
+    try:
+        payload = decode_token(refresh_token)
+    except JWTError:
+        return None
+    if payload.get("type") != "refresh" or payload.get("sub") != str(user_id):
+        return None
+    return payload.get("fid")
+
+
+async def _get_user_by_email(db: AsyncSession, email: str) -> User | None:
     stmt = select(User).where(User.email == email)
-    return db.execute(stmt).scalar_one_or_none()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register_user(
-    *, user_in: UserCreate, response: Response, db: Session = Depends(get_db)
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("register", client_ip))],
+)
+@query_budget(4)
+async def register_user(
+    *, user_in: UserCreate, response: Response, db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Create a new user and issue authentication cookies."""
 
-    existing_user = _get_user_by_email(db, user_in.email)
+    existing_user = await _get_user_by_email(db, user_in.email)
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    user = User(email=user_in.email, hashed_password=get_password_hash(user_in.password))
+    hashed_password = await get_password_hasher().hash(user_in.password)
+    user = User(email=user_in.email, hashed_password=hashed_password)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
-    access_token, refresh_token, access_max_age, refresh_max_age = _issue_tokens(user)
+    family, jti = await get_refresh_token_store().issue(db, user.id)
+    access_token, refresh_token, access_max_age, refresh_max_age = _issue_tokens(
+        user, family=family, jti=jti
+    )
     _set_auth_cookies(
         response,
         access_token=access_token,
@@ -131,21 +173,39 @@ def register_user(
     return user
 
 
-@router.post("/login", response_model=UserRead)
-def login_user(
-    *, credentials: LoginRequest, response: Response, db: Session = Depends(get_db)
+@router.post(
+    "/login",
+    response_model=UserRead,
+    dependencies=[
+        # Per address across all emails, so spraying one password over many
+        # accounts is throttled too, then per address and email.
+        Depends(rate_limit("login_ip", client_ip)),
+        Depends(rate_limit("login", login_identity)),
+    ],
+)
+@query_budget(2)
+async def login_user(
+    *, credentials: LoginRequest, response: Response, db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """Authenticate a user using email and password."""
 
-    user = _get_user_by_email(db, credentials.email)
-    if user is None or not verify_password(credentials.password, user.hashed_password):
+    user = await _get_user_by_email(db, credentials.email)
+    if user is None or not await get_password_hasher().verify(
+        credentials.password, user.hashed_password
+    ):
+        record_auth_event("login", "failure")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
     if not user.is_active:
+        record_auth_event("login", "inactive")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    record_auth_event("login", "success")
 
-    access_token, refresh_token, access_max_age, refresh_max_age = _issue_tokens(user)
+    family, jti = await get_refresh_token_store().issue(db, user.id)
+    access_token, refresh_token, access_max_age, refresh_max_age = _issue_tokens(
+        user, family=family, jti=jti
+    )
     _set_auth_cookies(
         response,
         access_token=access_token,
@@ -157,43 +217,63 @@ def login_user(
 
 
 @router.post("/refresh", response_model=UserRead)
-def refresh_session(
-    *, request: Request, response: Response, db: Session = Depends(get_db)
+@query_budget(4)
+async def refresh_session(
+    *, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)
 ) -> User:
-    """Issue a new access token using the refresh token cookie."""
+    """Issue a new access token and rotate the refresh token cookie.
+
+    Each refresh token can be used once; the one just replaced is still
+    answered with the newest token for a short grace window. Presenting an
+    older one revokes its whole family, logging out whoever holds the newest.
+    Tokens issued before families existed are adopted into one once.
+    """
 
     settings = get_settings()
     refresh_token = request.cookies.get(settings.refresh_token_cookie_name)
     if not refresh_token:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token missing")
+        raise _refresh_rejected("Refresh token missing")
 
     try:
-        payload = jwt.decode(
-            refresh_token,
-            settings.secret_key,
-            algorithms=[settings.algorithm],
-            options={"verify_aud": False},
-        )
+        payload = decode_token(refresh_token)
     except JWTError as exc:  # pragma: no cover - defensive branch
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token") from exc
+        raise _refresh_rejected("Invalid refresh token") from exc
 
     if payload.get("type") != "refresh":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token type")
+        raise _refresh_rejected("Invalid token type")
 
     subject = payload.get("sub")
+    family = payload.get("fid")
+    jti = payload.get("jti")
     if subject is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
+        raise _refresh_rejected("Invalid token payload")
 
     try:
         user_id = int(subject)
     except (TypeError, ValueError) as exc:  # pragma: no cover - defensive branch
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token subject") from exc
+        raise _refresh_rejected("Invalid token subject") from exc
 
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if user is None or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        raise _refresh_rejected("User not found")
 
-    access_token, new_refresh_token, access_max_age, refresh_max_age = _issue_tokens(user)
+    store = get_refresh_token_store()
+    try:
+        if family and jti:
+            new_jti = await store.rotate(db, user_id, family, jti)
+        else:
+            family = hashlib.sha256(refresh_token.encode()).hexdigest()[:32]
+            new_jti = await store.adopt(db, user_id, family)
+    except RefreshTokenRejectedError as exc:
+        if exc.reused:
+            logger.warning("Refresh token reuse for user %s; revoked session %s", user_id, family)
+            raise _refresh_rejected(exc.detail, "reused") from exc
+        raise _refresh_rejected(exc.detail) from exc
+    record_auth_event("refresh", "success")
+
+    access_token, new_refresh_token, access_max_age, refresh_max_age = _issue_tokens(
+        user, family=family, jti=new_jti
+    )
     _set_auth_cookies(
         response,
         access_token=access_token,
@@ -205,10 +285,35 @@ def refresh_session(
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout_user(
-    *, response: Response, current_user: User = Depends(get_current_user)
+@query_budget(2)
+async def logout_user(
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> None:
+    """Revoke the session's refresh token and clear authentication cookies."""
+
+    family = _refresh_family(request, current_user.id)
+    if family:
+        await get_refresh_token_store().revoke(db, current_user.id, family)
+    _clear_auth_cookies(response)
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(2)
+async def logout_everywhere(
+    *,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
 ) -> None:
-    """Clear authentication cookies to log the user out."""
+    """Revoke the refresh tokens of every session of the current user.
+
+    Access tokens already issued stay valid until they expire
+    (``ACCESS_TOKEN_EXPIRE_MINUTES``).
+    """
 
-    _ = current_user
+    await get_refresh_token_store().revoke_all(db, current_user.id)
     _clear_auth_cookies(response)
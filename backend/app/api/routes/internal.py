@@ -0,0 +1,54 @@
+"""Internal operational endpoints (not part of the public API schema)."""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from backend.app.core.security import get_token_cache
+from backend.app.db.session import get_pool_stats
+from backend.app.dependencies.auth import require_internal_token
+from backend.app.middleware.profiling import profiling_stats
+from backend.app.services.rate_limiter import get_rate_limiter
+from backend.app.services.response_cache import get_response_cache
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/db-pool")
+async def db_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Return connection pool counters, checkout wait histograms and gauges."""
+
+    return get_pool_stats()
+
+
+@router.get("/token-cache")
+async def token_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters of the verified access token cache."""
+
+    return get_token_cache().stats()
+
+
+@router.get("/response-cache")
+async def response_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters of the todo list response cache."""
+
+    return get_response_cache().stats()
+
+
+@router.get("/profiling")
+async def request_profiling_stats() -> Dict[str, Any]:
+    """Return per-route histograms of request phases (requires ``PROFILING_ENABLED``)."""
+
+    return profiling_stats.snapshot()
+
+
+@router.get("/rate-limiter")
+async def rate_limiter_stats() -> Dict[str, Any]:
+    """Return allowed/rejected counters of the rate limiter."""
+
+    return get_rate_limiter().stats()
@@ -0,0 +1,24 @@
+"""Prometheus exposition endpoint."""
+
+from fastapi import APIRouter, Depends, Response
+
+from backend.app.core.prometheus import render_metrics
+from backend.app.dependencies.auth import require_internal_token
+
+router = APIRouter(
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/metrics")
+def metrics() -> Response:
+    """Return all metrics in the Prometheus text format.
+
+    Declared sync so aggregating the multiprocess files runs in the thread
+    pool rather than on the event loop.
+    """
+
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
@@ -1,41 +1,242 @@
 """API router providing CRUD endpoints for todo items."""
 
-from typing import List, Optional
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi import status as http_status  # ``status`` is shadowed by query params
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
-from backend.app.api.deps import get_db
-from backend.app.dependencies.auth import get_current_user
+from backend.app.api.deps import get_async_db
+from backend.app.core.config import get_settings
+from backend.app.core.etag import etag_matches
+from backend.app.core.pagination import (
+    InvalidCursorError,
+    decode_sync_token,
+    encode_cursor,
+    encode_search_cursor,
+    encode_sync_token,
+)
+from backend.app.core.serialization import TypedJSONResponse, dump_json
+from backend.app.db.query_counter import query_budget
+from backend.app.dependencies.auth import get_current_user_async
+from backend.app.dependencies.rate_limit import WRITE_METHODS, rate_limit, user_identity
 from backend.app.models.todo import TodoStatus
-from backend.app.models.user import User
-from backend.app.schemas.todo import TodoCreate, TodoRead, TodoUpdate
-from backend.app.services.todo_service import TodoNotFoundError, TodoService
+from backend.app.schemas.todo import (
+    TodoBatchCreate,
+    TodoBatchDelete,
+    TodoBatchItemResult,
+    TodoBatchResult,
+    TodoBatchUpdate,
+    TodoChanges,
+    TodoCreate,
+    TodoRead,
+    TodoStats,
+    TodoUpdate,
+)
+from backend.app.services.response_cache import CachedResponse, get_response_cache
+from backend.app.services.todo_events import (
+    TodoEvent,
+    TodoEventBus,
+    TodoEventSubscription,
+    TooManyStreamsError,
+    get_todo_event_bus,
+)
+from backend.app.services.todo_service import (
+    TODO_READ_FIELDS,
+    AsyncTodoService,
+    SyncTokenExpiredError,
+    TodoNotFoundError,
+    todo_etag,
+)
+from backend.app.services.user_cache import UserSnapshot
 from backend.app.tasks.reminders import send_due_notifications
 
-router = APIRouter(prefix="/todos", tags=["todos"])
+router = APIRouter(
+    prefix="/todos",
+    tags=["todos"],
+    dependencies=[Depends(rate_limit("todo_writes", user_identity, methods=WRITE_METHODS))],
+)
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Clients may reuse a cached representation but must revalidate it first.
+CACHE_CONTROL = "private, no-cache"
+# Reconnection delay suggested to ``EventSource`` clients, in milliseconds.
+SSE_RETRY_MS = 3000
 
-@router.get("/", response_model=List[TodoRead])
-def list_todos(
+
+def _check_batch_size(size: int) -> None:
+    # Read per request so the limit follows the current settings.
+    limit = get_settings().todo_batch_max_items
+    if size > limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch exceeds the maximum of {limit} items.",
+        )
+
+
+def _null_fields_error(fields: List[str]) -> str:
+    return f"{', '.join(fields)} may not be null."
+
+
+def _validator_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=http_status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag))
+
+
+def _to_read(todo) -> TodoRead:  # type: ignore[no-untyped-def]
+    """Validate an ORM todo into ``TodoRead`` under Pydantic v1 or v2."""
+
+    if hasattr(TodoRead, "model_validate"):
+        return TodoRead.model_validate(todo, from_attributes=True)
+    return TodoRead.from_orm(todo)
+
+
+class TodoListResponse(TypedJSONResponse):
+    """Renders ``List[TodoRead]`` straight from ORM rows."""
+
+    content_type = List[TodoRead]
+
+
+def _json_response(cached: CachedResponse) -> Response:
+    return TodoListResponse(cached.body, headers=cached.headers)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Return the requested ``TodoRead`` fields in canonical order, or ``None`` for all."""
+
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(TODO_READ_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}.",
+        )
+    return tuple(name for name in TODO_READ_FIELDS if name in requested)
+
+
+def _render_rows(rows, fields: Optional[Tuple[str, ...]]) -> bytes:  # type: ignore[no-untyped-def]
+    if fields is None:
+        return dump_json(List[TodoRead], rows)
+    return dump_json(
+        List[Dict[str, Any]], [{name: row._mapping[name] for name in fields} for row in rows]
+    )
+
+
+def _batch_result(results: List[TodoBatchItemResult]) -> TodoBatchResult:
+    succeeded = sum(1 for result in results if result.ok)
+    return TodoBatchResult(
+        results=results, succeeded=succeeded, failed=len(results) - succeeded
+    )
+
+
+@router.get("/", response_model=List[TodoRead], response_class=TodoListResponse)
+@query_budget(3)
+async def list_todos(
     *,
     status: Optional[TodoStatus] = Query(None, description="Filter by todo status."),
     skip: int = Query(0, ge=0, description="Number of items to skip."),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return."),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> List[TodoRead]:
-    """Return a paginated list of todos for the current user."""
-
-    service = TodoService(db)
-    todos = service.list_todos(
-        user_id=current_user.id, status=status, skip=skip, limit=limit
-    )
-    return todos
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header; replaces skip.",
+    ),
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Comma-separated TodoRead fields to return, e.g. id,title,status,due_date; "
+            "omitted columns (such as description) are not read from the database."
+        ),
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> Response:
+    """Return a paginated list of todos for the current user.
+
+    When a full page is returned the ``X-Next-Cursor`` response header carries
+    the cursor for the following page. Rendered pages are served from the
+    response cache until the user's next write; on a miss the page ETag is
+    computed with an aggregate query first, so ``If-None-Match`` hits skip
+    loading the page.
+    """
+
+    selected = _parse_fields(fields)
+    cache = get_response_cache()
+    version = await cache.version(current_user.id)
+    key = ("list", status.value if status else None, skip, limit, cursor, selected)
+    cached = await cache.get(current_user.id, version, key) if version is not None else None
+    if cached is None:
+        service = AsyncTodoService(db)
+        page = dict(
+            user_id=current_user.id,
+            status=status,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            fields=selected,
+        )
+        try:
+            etag = await service.list_todos_etag(**page)
+            if etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            todos = await service.list_todos(**page)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=http_status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        headers = _validator_headers(etag)
+        if len(todos) == limit:
+            last = todos[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+        cached = CachedResponse(_render_rows(todos, selected), headers)
+        if version is not None:
+            await cache.set(current_user.id, version, key, cached)
+    elif etag_matches(if_none_match, cached.headers["ETag"]):
+        return _not_modified(cached.headers["ETag"])
+    return _json_response(cached)
 
 
-@router.get("/due-soon", response_model=List[TodoRead])
-def list_due_soon(
+@router.get("/search", response_model=List[TodoRead], response_class=TodoListResponse)
+@query_budget(2)
+async def search_todos(
+    *,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for."),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return."),
+    cursor: Optional[str] = Query(
+        None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header."
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> Response:
+    """Search the current user's todos by title and description, best matches first.
+
+    All words must match. When a full page is returned the ``X-Next-Cursor``
+    response header carries the cursor for the following page.
+    """
+
+    service = AsyncTodoService(db)
+    try:
+        rows = await service.search_todos(
+            user_id=current_user.id, query=q, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    headers = {}
+    if len(rows) == limit:
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_search_cursor(last.rank, last.id)
+    return TodoListResponse(_render_rows(rows, None), headers=headers)
+
+
+@router.get("/due-soon", response_model=List[TodoRead], response_class=TodoListResponse)
+@query_budget(2)
+async def list_due_soon(
     *,
     hours: int = Query(
         24,
@@ -43,18 +244,144 @@ def list_due_soon(
         le=168,
         description="Liczba godzin, w których zadania uznawane są za pilne.",
     ),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> List[TodoRead]:
-    """Return todos due within the next ``hours`` for the current user."""
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> Response:
+    """Return todos due within the next ``hours`` for the current user.
+
+    Cached responses may lag behind the clock by up to the cache TTL.
+    """
+
+    cache = get_response_cache()
+    version = await cache.version(current_user.id)
+    key = ("due-soon", hours)
+    cached = await cache.get(current_user.id, version, key) if version is not None else None
+    if cached is None:
+        service = AsyncTodoService(db)
+        todos = await service.list_due_soon(user_id=current_user.id, hours=hours)
+        cached = CachedResponse(_render_rows(todos, None), {})
+        if version is not None:
+            await cache.set(current_user.id, version, key, cached)
+    return _json_response(cached)
+
+
+@router.get("/stats", response_model=TodoStats)
+@query_budget(3)
+async def get_todo_stats(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> TodoStats:
+    """Return the current user's todo counts by status and the number overdue.
+
+    Status counts come from counters maintained on every write, so the cost
+    does not grow with the number of todos.
+    """
+
+    service = AsyncTodoService(db)
+    return TodoStats(**await service.get_stats(user_id=current_user.id))
+
+
+@router.get("/changes", response_model=TodoChanges)
+@query_budget(4)
+async def list_todo_changes(
+    *,
+    since: Optional[str] = Query(
+        None, description="Token from a previous response; omit for a full sync."
+    ),
+    limit: int = Query(100, ge=1, le=500, description="Maximum changes and deletions per page."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> TodoChanges:
+    """Return todos created or updated and ids deleted since the sync token.
+
+    Clients apply ``changed`` then ``deleted`` and keep ``next_token``; while
+    ``has_more`` is true they should call again right away. An expired token
+    yields ``410 Gone`` and requires a full sync.
+    """
 
-    service = TodoService(db)
-    return service.list_due_soon(user_id=current_user.id, hours=hours)
+    service = AsyncTodoService(db)
+    try:
+        token = decode_sync_token(since) if since else None
+        changes = await service.list_changes(user_id=current_user.id, since=token, limit=limit)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except SyncTokenExpiredError as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc)) from exc
+    return TodoChanges(
+        changed=[_to_read(todo) for todo in changes.changed],
+        deleted=changes.deleted,
+        next_token=encode_sync_token(changes.token),
+        has_more=changes.has_more,
+    )
+
+
+async def _event_stream(
+    bus: TodoEventBus,
+    subscription: TodoEventSubscription,
+    backlog: Optional[List[TodoEvent]],
+) -> AsyncIterator[str]:
+    heartbeat = get_settings().todo_events_heartbeat_seconds
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if backlog is None:
+            # The missed events are gone; the client has to refetch its todos.
+            yield "event: reset\ndata: {}\n\n"
+        else:
+            for event in backlog:
+                yield event.encode()
+        while True:
+            try:
+                event = await subscription.get(heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                # Too far behind; closing makes the client resume from its last id.
+                break
+            yield event.encode()
+    finally:
+        bus.unsubscribe(subscription)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+@query_budget(1)
+async def stream_todo_events(
+    *,
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> StreamingResponse:
+    """Stream changes to the current user's todos as server-sent events.
+
+    Emits ``created``, ``updated`` and ``deleted`` events whose data is the
+    todo (or its id for deletions). A ``Last-Event-ID`` header resumes after
+    that event; if it is no longer buffered a ``reset`` event is sent instead.
+    """
+
+    # The stream outlives the handler; hand the pooled connection back now.
+    await db.close()
+    try:
+        resume_after = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_after = -1
+    bus = get_todo_event_bus()
+    try:
+        subscription, backlog = await bus.subscribe(current_user.id, resume_after)
+    except TooManyStreamsError as exc:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=exc.detail) from exc
+    return StreamingResponse(
+        _event_stream(bus, subscription, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Covers streams that end before the generator first runs.
+        background=BackgroundTask(bus.unsubscribe, subscription),
+    )
 
 
 @router.post("/trigger-reminders", status_code=status.HTTP_202_ACCEPTED)
 def trigger_reminders(
-    _current_user: User = Depends(get_current_user),
+    _current_user: UserSnapshot = Depends(get_current_user_async),
 ) -> dict[str, str]:
     """Trigger the reminder task manually (useful for development/testing)."""
 
@@ -63,48 +390,165 @@ def trigger_reminders(
 
 
 @router.post("/", response_model=TodoRead, status_code=status.HTTP_201_CREATED)
-def create_todo(
+@query_budget(4)
+async def create_todo(
     *,
     todo_in: TodoCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
 ) -> TodoRead:
     """Create a new todo item for the current user."""
 
-    service = TodoService(db)
-    todo = service.create_todo(user_id=current_user.id, todo_in=todo_in)
+    service = AsyncTodoService(db)
+    todo = await service.create_todo(user_id=current_user.id, todo_in=todo_in)
     return todo
 
 
+@router.post("/batch", response_model=TodoBatchResult, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
+async def create_todos_batch(
+    *,
+    batch: TodoBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> TodoBatchResult:
+    """Create several todo items for the current user in one transaction."""
+
+    _check_batch_size(len(batch.items))
+    service = AsyncTodoService(db)
+    todos = await service.create_todos(user_id=current_user.id, items=batch.items)
+    return _batch_result(
+        [
+            TodoBatchItemResult(index=index, id=todo.id, ok=True, todo=_to_read(todo))
+            for index, todo in enumerate(todos)
+        ]
+    )
+
+
+@router.patch("/batch", response_model=TodoBatchResult)
+# One UPDATE per distinct set of changed fields: at most 15, plus one for
+# items that only touch ``updated_at``.
+@query_budget(20)
+async def update_todos_batch(
+    *,
+    batch: TodoBatchUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> TodoBatchResult:
+    """Partially update several todo items; unknown ids are reported per item.
+
+    Items setting a non-nullable field to ``null`` are rejected on their own
+    and not applied.
+    """
+
+    _check_batch_size(len(batch.items))
+    null_fields = [item.null_fields() for item in batch.items]
+    valid = [item for item, fields in zip(batch.items, null_fields) if not fields]
+    service = AsyncTodoService(db)
+    updated, missing = await service.update_todos(user_id=current_user.id, items=valid)
+    results = []
+    seen = set()
+    for index, item in enumerate(batch.items):
+        if null_fields[index]:
+            error: Optional[str] = _null_fields_error(null_fields[index])
+        elif item.id in missing:
+            error = "Todo item not found."
+        elif item.id in seen:
+            error = "Duplicate id in batch."
+        else:
+            error = None
+        if not null_fields[index]:
+            seen.add(item.id)
+        todo = updated.get(item.id) if error is None else None
+        results.append(
+            TodoBatchItemResult(
+                index=index,
+                id=item.id,
+                ok=error is None,
+                error=error,
+                todo=_to_read(todo) if todo is not None else None,
+            )
+        )
+    return _batch_result(results)
+
+
+@router.delete("/batch", response_model=TodoBatchResult)
+@query_budget(4)
+async def delete_todos_batch(
+    *,
+    batch: TodoBatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> TodoBatchResult:
+    """Delete several todo items; unknown ids are reported per item."""
+
+    _check_batch_size(len(batch.ids))
+    service = AsyncTodoService(db)
+    deleted = await service.delete_todos(user_id=current_user.id, ids=batch.ids)
+    results = []
+    seen = set()
+    for index, todo_id in enumerate(batch.ids):
+        if todo_id not in deleted:
+            error: Optional[str] = "Todo item not found."
+        elif todo_id in seen:
+            error = "Duplicate id in batch."
+        else:
+            error = None
+        seen.add(todo_id)
+        results.append(
+            TodoBatchItemResult(index=index, id=todo_id, ok=error is None, error=error)
+        )
+    return _batch_result(results)
+
+
 @router.get("/{todo_id}", response_model=TodoRead)
-def get_todo(
+@query_budget(2)
+async def get_todo(
     *,
     todo_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-) -> TodoRead:
-    """Retrieve a single todo item owned by the current user."""
+    if_none_match: Optional[str] = Header(None),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
+) -> Union[TodoRead, Response]:
+    """Retrieve a single todo item owned by the current user.
+
+    Answers ``304 Not Modified`` when ``If-None-Match`` matches the item ETag.
+    """
 
-    service = TodoService(db)
+    service = AsyncTodoService(db)
     try:
-        return service.get_todo(todo_id=todo_id, user_id=current_user.id)
+        todo = await service.get_todo(todo_id=todo_id, user_id=current_user.id)
     except TodoNotFoundError as exc:  # pragma: no cover - simple passthrough
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    etag = todo_etag(todo)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers.update(_validator_headers(etag))
+    return todo
 
 
 @router.put("/{todo_id}", response_model=TodoRead)
-def update_todo(
+# User load on a cold cache, todo load, counter upsert, UPDATE, refresh.
+@query_budget(5)
+async def update_todo(
     *,
     todo_id: int,
     todo_in: TodoUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
 ) -> TodoRead:
     """Update a todo item belonging to the current user."""
 
-    service = TodoService(db)
+    null_fields = todo_in.null_fields()
+    if null_fields:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=_null_fields_error(null_fields),
+        )
+    service = AsyncTodoService(db)
     try:
-        return service.update_todo(
+        return await service.update_todo(
             todo_id=todo_id, user_id=current_user.id, todo_in=todo_in
         )
     except TodoNotFoundError as exc:  # pragma: no cover - simple passthrough
@@ -112,16 +556,17 @@ def update_todo(
 
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_todo(
+@query_budget(5)
+async def delete_todo(
     *,
     todo_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserSnapshot = Depends(get_current_user_async),
 ) -> None:
     """Delete a todo item belonging to the current user."""
 
-    service = TodoService(db)
+    service = AsyncTodoService(db)
     try:
-        service.delete_todo(todo_id=todo_id, user_id=current_user.id)
+        await service.delete_todo(todo_id=todo_id, user_id=current_user.id)
     except TodoNotFoundError as exc:  # pragma: no cover - simple passthrough
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
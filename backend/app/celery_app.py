@@ -3,28 +3,140 @@
 from __future__ import annotations
 
 import os
+import time
 from datetime import timedelta
+from typing import Any, Dict, Tuple
 
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_shutdown, worker_ready
 
 BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", BROKER_URL)
 TIMEZONE = os.getenv("CELERY_TIMEZONE", "UTC")
-REMINDER_INTERVAL_MINUTES = int(os.getenv("REMINDER_INTERVAL_MINUTES", "60"))
+# The periodic scan sends reminders unless the timer wheel and its dispatcher
+# are deployed (REMINDER_SCHEDULER_BACKEND=redis); it then remains a safety
+# net and 0 disables it.
+REMINDER_INTERVAL_MINUTES = int(os.getenv("REMINDER_INTERVAL_MINUTES", "5"))
+REMINDER_BATCH_SIZE = int(os.getenv("REMINDER_BATCH_SIZE", "500"))
+STATS_RECONCILE_INTERVAL_MINUTES = int(os.getenv("STATS_RECONCILE_INTERVAL_MINUTES", "60"))
+# Serves the worker's metrics over HTTP, e.g. when it does not share
+# PROMETHEUS_MULTIPROC_DIR with the API; 0 disables the server. Tasks of the
+# prefork pool run in child processes, so the server only sees them when
+# PROMETHEUS_MULTIPROC_DIR is set (or with --pool=solo/threads).
+CELERY_METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", "0"))
 
 celery_app = Celery(
     "backend.app",
     broker=BROKER_URL,
     backend=RESULT_BACKEND,
-    include=["backend.app.tasks.reminders"],
+    include=[
+        "backend.app.tasks.refresh_tokens",
+        "backend.app.tasks.reminders",
+        "backend.app.tasks.stats",
+        "backend.app.tasks.tombstones",
+    ],
 )
 
 celery_app.conf.timezone = TIMEZONE
 celery_app.conf.beat_schedule = {
-    "send-due-notifications": {
+    "prune-todo-tombstones": {
+        "task": "backend.app.tasks.tombstones.prune_todo_tombstones",
+        "schedule": timedelta(days=1),
+    },
+    "prune-refresh-token-families": {
+        "task": "backend.app.tasks.refresh_tokens.prune_refresh_token_families",
+        "schedule": timedelta(days=1),
+    },
+    "reconcile-todo-stats": {
+        "task": "backend.app.tasks.stats.reconcile_todo_stats",
+        "schedule": timedelta(minutes=STATS_RECONCILE_INTERVAL_MINUTES),
+    },
+}
+if REMINDER_INTERVAL_MINUTES > 0:
+    celery_app.conf.beat_schedule["send-due-notifications"] = {
         "task": "backend.app.tasks.reminders.send_due_notifications",
         "schedule": timedelta(minutes=REMINDER_INTERVAL_MINUTES),
     }
-}
 
 celery_app.autodiscover_tasks(lambda: ["backend.app.tasks"])
+
+
+_REMINDER_TASK_PREFIX = "backend.app.tasks.reminders."
+# Tasks whose integer result is the number of reminders sent.
+_REMINDER_SENDING_TASKS = {
+    "backend.app.tasks.reminders.send_reminder_batch",
+    "backend.app.tasks.reminders.send_todo_reminders",
+}
+_task_started: Dict[str, float] = {}
+
+
+@task_prerun.connect
+def _start_task_timer(task_id: str = "", task=None, **_kwargs) -> None:  # type: ignore[no-untyped-def]
+    if task is not None and task.name.startswith(_REMINDER_TASK_PREFIX):
+        _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _record_task_metrics(  # type: ignore[no-untyped-def]
+    task_id: str = "", task=None, retval=None, state=None, **_kwargs
+) -> None:
+    started = _task_started.pop(task_id, None)
+    if started is None:
+        return
+    from backend.app.core.prometheus import REMINDERS_SENT, TASK_DURATION
+
+    TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+    if task.name in _REMINDER_SENDING_TASKS and isinstance(retval, int):
+        REMINDERS_SENT.labels(task.name).inc(retval)
+
+
+@worker_ready.connect
+def _start_metrics_server(**_kwargs) -> None:  # type: ignore[no-untyped-def]
+    if CELERY_METRICS_PORT <= 0:
+        return
+    from prometheus_client import start_http_server
+
+    from backend.app.core.prometheus import metrics_registry
+
+    start_http_server(CELERY_METRICS_PORT, registry=metrics_registry())
+
+
+@worker_process_shutdown.connect
+def _drop_live_metrics(pid: int = 0, **_kwargs) -> None:  # type: ignore[no-untyped-def]
+    from backend.app.core.prometheus import mark_process_dead
+
+    mark_process_dead(pid or None)
+
+
+# task_id -> (counter context manager, counter) while query budgets are checked.
+_task_query_counters: Dict[str, Tuple[Any, Any]] = {}
+
+
+@task_prerun.connect
+def _start_query_counter(task_id: str = "", task=None, **_kwargs) -> None:  # type: ignore[no-untyped-def]
+    from backend.app.core.config import get_settings
+    from backend.app.db.query_counter import count_queries
+
+    if get_settings().query_budget_mode not in ("warn", "raise"):
+        return
+    context = count_queries(task.name)
+    _task_query_counters[task_id] = (context, context.__enter__())
+
+
+@task_postrun.connect
+def _check_query_budget(task_id: str = "", task=None, **_kwargs) -> None:  # type: ignore[no-untyped-def]
+    entry = _task_query_counters.pop(task_id, None)
+    if entry is None:
+        return
+    from backend.app.core.config import get_settings
+    from backend.app.db.query_counter import check_query_budget, declared_budget
+
+    context, counter = entry
+    context.__exit__(None, None, None)
+    settings = get_settings()
+    check_query_budget(
+        counter,
+        declared_budget(task.run),
+        mode=settings.query_budget_mode,
+        repeat_threshold=settings.query_repeat_threshold,
+    )
@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
+    refresh_token_store_backend: str = "sql"
+    refresh_token_reuse_grace_seconds: int = 10
     access_token_cookie_name: str = "access_token"
     refresh_token_cookie_name: str = "refresh_token"
     csrf_cookie_name: str = "csrf_token"
@@ -44,6 +46,52 @@ class Settings(BaseSettings):
     cookie_domain: str | None = Field(default=None, env="COOKIE_DOMAIN")
     cookie_secure: bool = Field(default=False, env="COOKIE_SECURE")
     cookie_samesite: str = Field(default="lax", env="COOKIE_SAMESITE")
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    internal_endpoints_enabled: bool = False
+    internal_endpoints_token: str = ""
+    redis_url: str = "redis://localhost:6379/1"
+    user_cache_backend: str = "memory"
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 10_000
+    token_cache_enabled: bool = True
+    token_cache_max_entries: int = 10_000
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    todo_batch_max_items: int = 500
+    todo_events_backend: str = "memory"
+    todo_events_replay_size: int = 100
+    todo_events_queue_size: int = 100
+    todo_events_heartbeat_seconds: float = 15.0
+    todo_events_max_streams_per_user: int = 5
+    todo_tombstone_retention_days: int = 30
+    # "memory" keeps versions per process: single API worker only; use
+    # "redis" with several workers.
+    response_cache_backend: str = "none"
+    response_cache_ttl_seconds: int = 30
+    response_cache_max_entries: int = 5_000
+    # "redis" needs the dispatcher process (python -m backend.app.tasks.dispatcher).
+    reminder_scheduler_backend: str = "none"
+    reminder_lead_hours: int = 24
+    reminder_dispatch_interval_seconds: float = 1.0
+    rate_limit_backend: str = "memory"
+    rate_limit_max_keys: int = 100_000
+    rate_limit_login: str = "10/minute"
+    rate_limit_login_ip: str = "30/minute"
+    rate_limit_register: str = "5/minute"
+    rate_limit_todo_writes: str = "300/minute"
+    metrics_enabled: bool = False
+    query_budget_mode: str = "off"
+    query_budget_default: int = 0
+    query_repeat_threshold: int = 5
+    profiling_enabled: bool = False
+    profiling_slow_request_ms: float = 500.0
+    profiling_sample_rate: float = 0.0
+    profiling_profiler: str = "cprofile"
+    profiling_output_dir: str = "profiles"
 
     class Config:
         env_file = ".env"
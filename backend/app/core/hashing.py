@@ -0,0 +1,100 @@
+"""Process-pool executor that keeps bcrypt work off the API event loop."""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from backend.app.core.config import get_settings
+from backend.app.core.security import get_password_hash, verify_password
+
+
+class HashingOverloadedError(Exception):
+    """Raised when too many password hashing jobs are already queued."""
+
+    def __init__(self, detail: str = "Authentication service is busy, try again shortly.") -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+class PasswordHasher:
+    """Run bcrypt hashing and verification in worker processes.
+
+    ``workers=0`` falls back to the default thread pool, which is enough for
+    development and tests. ``max_pending`` bounds the number of in-flight jobs;
+    once reached new jobs are rejected with :class:`HashingOverloadedError`
+    instead of piling up behind a saturated pool.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            # ``spawn`` avoids forking a parent that already runs DB driver threads.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            raise HashingOverloadedError()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a fresh one.
+            self._executor = None
+            raise
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Return the bcrypt hash of ``password``."""
+
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Return whether ``plain_password`` matches ``hashed_password``."""
+
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def warm_up(self) -> None:
+        """Start every worker process and load bcrypt before serving traffic."""
+
+        executor = self._get_executor()
+        if executor is None:
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, get_password_hash, "warm-up")
+                for _ in range(self.workers)
+            )
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache()
+def get_password_hasher() -> PasswordHasher:
+    """Return the process-wide password hasher configured from settings."""
+
+    settings = get_settings()
+    return PasswordHasher(
+        workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
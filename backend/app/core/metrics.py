@@ -0,0 +1,59 @@
+"""Lightweight, dependency-free metric primitives shared by instrumentation."""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+
+# Latency buckets in seconds, roughly log-spaced from 1 ms to 10 s.
+DEFAULT_LATENCY_BUCKETS: Sequence[float] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed upper bounds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets: List[float] = sorted(buckets)
+        self._counts: List[int] = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return cumulative bucket counts along with count, sum and max."""
+
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum, maximum = self._count, self._sum, self._max
+        cumulative: Dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[f"{bound:g}"] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"count": total, "sum": total_sum, "max": maximum, "buckets": cumulative}
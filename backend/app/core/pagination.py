@@ -0,0 +1,91 @@
+"""Helpers for opaque keyset pagination cursors and delta sync tokens."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(token: str) -> Any:
+    padded = token + "=" * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Return an opaque, URL-safe token for the ``(created_at, id)`` position."""
+
+    return _encode([created_at.isoformat(), item_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by :func:`encode_cursor`."""
+
+    try:
+        created_at_raw, item_id = _decode(cursor)
+        return datetime.fromisoformat(created_at_raw), int(item_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor.") from exc
+
+
+def encode_search_cursor(rank: float, item_id: int) -> str:
+    """Return an opaque token for the ``(rank, id)`` position in search results."""
+
+    return _encode([rank, item_id])
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a token produced by :func:`encode_search_cursor`."""
+
+    try:
+        rank, item_id = _decode(cursor)
+        return float(rank), int(item_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor.") from exc
+
+
+class SyncToken(NamedTuple):
+    """Position of a delta sync client.
+
+    ``updated_at``/``todo_id`` is the last change seen, ``tombstone_id`` the
+    last deletion seen and ``issued_at`` when the token was handed out.
+    """
+
+    issued_at: datetime
+    updated_at: datetime
+    todo_id: int
+    tombstone_id: int
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    """Return an opaque, URL-safe form of ``token``."""
+
+    return _encode(
+        [token.issued_at.isoformat(), token.updated_at.isoformat(), token.todo_id, token.tombstone_id]
+    )
+
+
+def decode_sync_token(value: str) -> SyncToken:
+    """Decode a token produced by :func:`encode_sync_token`."""
+
+    try:
+        issued_at, updated_at, todo_id, tombstone_id = _decode(value)
+        return SyncToken(
+            datetime.fromisoformat(issued_at),
+            datetime.fromisoformat(updated_at),
+            int(todo_id),
+            int(tombstone_id),
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid sync token.") from exc
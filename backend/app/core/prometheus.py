@@ -0,0 +1,125 @@
+"""Prometheus metrics for the API, the database pools and the Celery reminder tasks.
+
+Metrics are process-local unless ``PROMETHEUS_MULTIPROC_DIR`` points to an
+empty directory shared by every process (uvicorn workers, Celery worker
+children) before they start; :func:`render_metrics` then aggregates the
+per-process files, so any worker can answer a scrape.
+"""
+
+import os
+from typing import Callable, Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from backend.app.core.metrics import DEFAULT_LATENCY_BUCKETS
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by method and route template.",
+    ("method", "route"),
+    buckets=DEFAULT_LATENCY_BUCKETS,
+)
+AUTH_EVENTS = Counter(
+    "auth_events_total",
+    "Authentication outcomes (login, refresh and access token checks).",
+    ("event", "outcome"),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ("engine",),
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_open_connections",
+    "Connections currently held open by the pool.",
+    ("engine",),
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connection checkouts from the pool.", ("engine",)
+)
+DB_POOL_INVALIDATIONS = Counter(
+    "db_pool_invalidations_total", "Pooled connections invalidated after errors.", ("engine",)
+)
+TASK_DURATION = Histogram(
+    "reminder_task_duration_seconds",
+    "Run time of the reminder Celery tasks.",
+    ("task", "state"),
+    buckets=DEFAULT_LATENCY_BUCKETS,
+)
+REMINDERS_SENT = Counter(
+    "reminders_sent_total", "Reminder notifications sent, by task.", ("task",)
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Return the registry to expose: this process's, or the multiprocess aggregate."""
+
+    if not multiprocess_enabled():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return the exposition body and its content type."""
+
+    return generate_latest(metrics_registry()), CONTENT_TYPE
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop the live gauges of an exiting process from the aggregate."""
+
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def pool_event_recorder(name: str) -> Callable[[str], None]:
+    """Return a :class:`~backend.app.db.pool_metrics.PoolMetrics` event hook for pool ``name``.
+
+    The pool's own listeners drive the hook, so the exported gauges and
+    counters follow exactly the events ``/api/internal/db-pool`` reports.
+    """
+
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    connections = DB_POOL_CONNECTIONS.labels(name)
+    checkouts = DB_POOL_CHECKOUTS.labels(name)
+    invalidations = DB_POOL_INVALIDATIONS.labels(name)
+    updates: Dict[str, Tuple[Callable[[], None], ...]] = {
+        "connects": (connections.inc,),
+        "closes": (connections.dec,),
+        "checkouts": (checked_out.inc, checkouts.inc),
+        "checkins": (checked_out.dec,),
+        "invalidations": (invalidations.inc,),
+    }
+
+    def record(counter: str) -> None:
+        for update in updates.get(counter, ()):
+            update()
+
+    return record
+
+
+def record_auth_event(event_name: str, outcome: str) -> None:
+    AUTH_EVENTS.labels(event_name, outcome).inc()
@@ -0,0 +1,22 @@
+"""Shared Redis clients built from application settings."""
+
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+
+from backend.app.core.config import get_settings
+
+
+@lru_cache()
+def get_redis() -> "aioredis.Redis":
+    """Return the process-wide asyncio Redis client."""
+
+    return aioredis.Redis.from_url(get_settings().redis_url)
+
+
+@lru_cache()
+def get_sync_redis() -> redis.Redis:
+    """Return the process-wide blocking Redis client (Celery tasks, sync ORM hooks)."""
+
+    return redis.Redis.from_url(get_settings().redis_url)
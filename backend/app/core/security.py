@@ -1,16 +1,29 @@
 """Security helpers for password hashing and JWT token generation."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, Optional, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from backend.app.core.config import get_settings
+from backend.app.core.token_cache import VerifiedTokenCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@lru_cache()
+def get_token_cache() -> VerifiedTokenCache:
+    """Return the process-wide cache of verified token claims."""
+
+    settings = get_settings()
+    return VerifiedTokenCache(
+        max_entries=settings.token_cache_max_entries,
+        enabled=settings.token_cache_enabled,
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Return whether the provided password matches the stored hash."""
 
@@ -50,3 +63,24 @@ def create_access_token(
         to_encode.update(additional_claims)
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Verify ``token`` and return its claims, reusing earlier verifications.
+
+    Raises :class:`jose.JWTError` for invalid or expired tokens.
+    """
+
+    cache = get_token_cache()
+    claims = cache.get(token)
+    if claims is not None:
+        return claims
+    settings = get_settings()
+    claims = jwt.decode(
+        token,
+        settings.secret_key,
+        algorithms=[settings.algorithm],
+        options={"verify_aud": False},
+    )
+    cache.set(token, claims)
+    return claims
@@ -0,0 +1,67 @@
+"""Per-request phase timings collected through a context variable.
+
+:class:`~backend.app.middleware.profiling.ProfilingMiddleware` installs a
+:class:`RequestTimings` for every request; code on the hot path wraps its
+phases in :func:`timed`. Outside a profiled request :func:`timed` only costs
+a context variable lookup.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, Optional, Tuple
+
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Seconds spent per phase, plus SQL statement count, for one request.
+
+    Phases may overlap (e.g. SQL issued while authenticating counts towards
+    both ``auth`` and ``sql``).
+    """
+
+    __slots__ = ("phases", "sql_statements")
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = {}
+        self.sql_statements = 0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_query(self, seconds: float) -> None:
+        self.sql_statements += 1
+        self.add("sql", seconds)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings of the request being handled, if it is profiled."""
+
+    return _current.get()
+
+
+def start_request_timings() -> Tuple[RequestTimings, "Token[Optional[RequestTimings]]"]:
+    """Install fresh timings for the current context; return them and the reset token."""
+
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def reset_request_timings(token: "Token[Optional[RequestTimings]]") -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the ``with`` block to ``phase`` of the current request."""
+
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
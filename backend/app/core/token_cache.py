@@ -0,0 +1,73 @@
+"""Bounded cache of verified JWT claims keyed by a digest of the raw token."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class VerifiedTokenCache:
+    """LRU cache holding decoded claims until the token's ``exp`` passes.
+
+    Only tokens that passed signature verification are stored, and the key is
+    a SHA-256 digest so raw bearer tokens never sit in process memory twice.
+    """
+
+    def __init__(self, *, max_entries: int, enabled: bool = True) -> None:
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return cached claims for ``token`` or ``None`` on a miss."""
+
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is not None and claims["exp"] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return claims
+            if claims is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """Store verified ``claims``; tokens without an ``exp`` are not cached."""
+
+        if not self.enabled or not isinstance(claims.get("exp"), (int, float)):
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
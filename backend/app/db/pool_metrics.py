@@ -0,0 +1,134 @@
+"""Connection pool instrumentation built on SQLAlchemy pool events."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from backend.app.core.metrics import Histogram
+
+# Checkout waits are usually sub-millisecond; anything in the upper buckets
+# means the pool is undersized for the worker's concurrency.
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolMetrics:
+    """Counters and a checkout wait histogram for a single engine pool.
+
+    ``on_event`` is called with the counter name on every increment, which
+    lets exporters (see :func:`backend.app.core.prometheus.pool_event_recorder`)
+    follow the pool without registering listeners of their own.
+    """
+
+    def __init__(self, name: str, on_event: Optional[Callable[[str], None]] = None) -> None:
+        self.name = name
+        self.on_event = on_event
+        self.wait_seconds = Histogram(POOL_WAIT_BUCKETS)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {
+            "connects": 0,
+            "closes": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "invalidations": 0,
+            "overflow_checkouts": 0,
+            "timeouts": 0,
+        }
+        self.peak_overflow = 0
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+        if self.on_event is not None:
+            self.on_event(counter)
+
+    def record_wait(self, seconds: float, overflow: int) -> None:
+        """Record how long a checkout waited and the overflow level it saw."""
+
+        self.wait_seconds.observe(seconds)
+        if overflow > 0:
+            with self._lock:
+                self._counters["overflow_checkouts"] += 1
+                self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        """Return counters, the wait histogram and live gauges for ``pool``."""
+
+        with self._lock:
+            data: Dict[str, Any] = dict(self._counters)
+            data["peak_overflow"] = self.peak_overflow
+        data["wait_seconds"] = self.wait_seconds.snapshot()
+        if pool is not None:
+            data["pool_class"] = type(pool).__name__
+            for gauge in ("size", "checkedin", "checkedout", "overflow"):
+                reader = getattr(pool, gauge, None)
+                if callable(reader):
+                    data[gauge] = reader()
+        return data
+
+
+class _TimedCheckoutMixin:
+    """Time ``_do_get`` so checkout waits and pool timeouts can be observed.
+
+    SQLAlchemy only emits ``checkout`` once a connection has been handed out,
+    so the wait itself has to be measured around the pool's internal getter.
+    """
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.increment("timeouts")
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start, self.overflow())  # type: ignore[attr-defined]
+        return record
+
+    def recreate(self):  # type: ignore[no-untyped-def]
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """``QueuePool`` that reports checkout waits to :class:`PoolMetrics`."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that reports checkout waits to :class:`PoolMetrics`."""
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> PoolMetrics:
+    """Attach pool event listeners of ``engine`` to ``metrics``."""
+
+    if isinstance(engine.pool, _TimedCheckoutMixin):
+        engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        metrics.increment("closes")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):  # type: ignore[no-untyped-def]
+        metrics.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):  # type: ignore[no-untyped-def]
+        metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):  # type: ignore[no-untyped-def]
+        metrics.increment("invalidations")
+
+    return metrics
@@ -0,0 +1,184 @@
+"""Count the SQL statements of a request or task and enforce query budgets.
+
+:func:`install_query_counter` hooks both engines (see ``db/session.py``);
+statements are attributed to every :class:`QueryCounter` active in the
+current context, so nested counters (a test around a request) all see them.
+Without an active counter the hook costs one context variable lookup. An
+``executemany`` counts as one statement, also when the dialect sends it in
+several batches (SQLite's ``INSERT ... RETURNING`` of a bulk ORM insert), so
+budgets are the same on every backend.
+
+Routes and tasks declare their budget with :func:`query_budget`; the
+:class:`~backend.app.middleware.query_budget.QueryBudgetMiddleware` and the
+Celery task signals check it in ``warn`` mode (development) or ``raise`` mode
+(tests). Tests can also wrap any code in :func:`assert_max_queries`.
+"""
+
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryCounter"]] = ContextVar("query_counter", default=None)
+_BUDGET_ATTR = "query_budget"
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block, request or task issued more statements than allowed."""
+
+
+class QueryCounter:
+    """Statements executed while the counter was active, by SQL text."""
+
+    __slots__ = ("label", "count", "statements", "parent", "last_context")
+
+    def __init__(self, label: str = "", parent: Optional["QueryCounter"] = None) -> None:
+        self.label = label
+        self.count = 0
+        self.statements: Counter = Counter()
+        self.parent = parent
+        # Execution context of the last executemany, to count its batches once.
+        self.last_context: Any = None
+
+    def record(self, statement: str) -> None:
+        counter: Optional[QueryCounter] = self
+        while counter is not None:
+            counter.count += 1
+            counter.statements[statement] += 1
+            counter = counter.parent
+
+    def repeated(self, threshold: int) -> list:
+        """Return ``(statement, times)`` pairs run at least ``threshold`` times.
+
+        The same statement text run over and over is the signature of an N+1
+        pattern, e.g. a lazy ``TodoItem.owner`` load inside a loop.
+        """
+
+        return [(sql, times) for sql, times in self.statements.most_common() if times >= threshold]
+
+    def describe(self, limit: int = 5) -> str:
+        return "\n".join(
+            f"{times}x {' '.join(sql.split())[:200]}"
+            for sql, times in self.statements.most_common(limit)
+        )
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Attribute every statement ``engine`` executes to the active counters.
+
+    For an ``AsyncEngine`` pass its ``sync_engine``; the cursor events run in
+    the caller's context.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        counter = _current.get()
+        if counter is None:
+            return
+        if executemany:
+            if context is not None and context is counter.last_context:
+                return
+            counter.last_context = context
+        counter.record(statement)
+
+
+def current_query_counter() -> Optional[QueryCounter]:
+    return _current.get()
+
+
+@contextmanager
+def count_queries(label: str = "") -> Iterator[QueryCounter]:
+    """Count the statements executed inside the ``with`` block."""
+
+    counter = QueryCounter(label, parent=_current.get())
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "") -> Iterator[QueryCounter]:
+    """Fail with :class:`QueryBudgetExceeded` when the block runs more than ``limit`` statements.
+
+    Meant for tests. The code must run in the caller's context, so use
+    ``httpx.AsyncClient(transport=httpx.ASGITransport(app))`` rather than
+    ``TestClient``, whose requests run on another thread::
+
+        with assert_max_queries(3):
+            await client.get("/api/todos/")
+    """
+
+    with count_queries(label) as counter:
+        yield counter
+    if counter.count > limit:
+        raise QueryBudgetExceeded(_budget_message(counter, limit))
+
+
+def query_budget(limit: int) -> Callable[[_F], _F]:
+    """Declare the maximum number of statements a route or task may run.
+
+    Apply it below the router (or Celery) decorator so the registered
+    function carries the budget::
+
+        @router.get("/stats")
+        @query_budget(3)
+        async def get_todo_stats(...): ...
+    """
+
+    def decorator(func: _F) -> _F:
+        setattr(func, _BUDGET_ATTR, limit)
+        return func
+
+    return decorator
+
+
+def declared_budget(func: Any) -> Optional[int]:
+    return getattr(func, _BUDGET_ATTR, None)
+
+
+def check_query_budget(
+    counter: QueryCounter,
+    budget: Optional[int],
+    *,
+    mode: str,
+    repeat_threshold: int = 0,
+) -> None:
+    """Warn about or raise for a counter over ``budget`` or with repeated statements.
+
+    ``mode`` is ``warn`` (log) or ``raise`` (:class:`QueryBudgetExceeded`);
+    anything else disables the check.
+    """
+
+    if mode not in ("warn", "raise"):
+        return
+    if budget is not None and counter.count > budget:
+        message = _budget_message(counter, budget)
+        if mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    elif repeat_threshold > 0:
+        repeated = counter.repeated(repeat_threshold)
+        if repeated:
+            sql, times = repeated[0]
+            logger.warning(
+                "Possible N+1 in %s: statement ran %d times: %s",
+                counter.label or "block",
+                times,
+                " ".join(sql.split())[:200],
+            )
+
+
+def _budget_message(counter: QueryCounter, limit: int) -> str:
+    return (
+        f"{counter.label or 'Block'} ran {counter.count} SQL statements, "
+        f"budget is {limit}:\n{counter.describe()}"
+    )
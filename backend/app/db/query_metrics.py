@@ -0,0 +1,30 @@
+"""Per-request SQL timing built on SQLAlchemy cursor events."""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.app.core.timing import current_timings
+
+# Stored on the execution context so statements that fail leave nothing behind.
+_START_ATTR = "_query_started_at"
+
+
+def instrument_queries(engine: Engine) -> None:
+    """Record the duration of every statement ``engine`` executes.
+
+    Durations go to the current request's :class:`RequestTimings`; statements
+    run outside a profiled request are not recorded. For an ``AsyncEngine``
+    pass its ``sync_engine``; the cursor events run in the request's context.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        setattr(context, _START_ATTR, time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        timings = current_timings()
+        if timings is not None:
+            timings.add_query(time.perf_counter() - getattr(context, _START_ATTR))
@@ -2,20 +2,99 @@
 
 import os
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import Pool
+
+from backend.app.core.config import get_settings
+from backend.app.core.prometheus import pool_event_recorder
+from backend.app.db.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    instrument_engine,
+)
+from backend.app.db.query_counter import install_query_counter
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
-engine_kwargs = {"future": True}
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+}
+
+
+def _to_async_url(url: str) -> str:
+    """Return ``url`` rewritten to use an asyncio-capable DBAPI driver."""
+
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in _ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=_ASYNC_DRIVERS[backend])
+    return parsed.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+
+
+def _pool_kwargs(url: str, poolclass: type[Pool]) -> Dict[str, Any]:
+    """Return pool configuration from settings for the engine serving ``url``."""
+
+    settings = get_settings()
+    kwargs: Dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite lives inside a single connection; keep the default pool.
+        return kwargs
+    kwargs.update(
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+    )
+    return kwargs
+
+
+engine_kwargs = {"future": True, **_pool_kwargs(DATABASE_URL, InstrumentedQueuePool)}
 if DATABASE_URL.startswith("sqlite"):
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 
 engine = create_engine(DATABASE_URL, **engine_kwargs)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_pool_kwargs(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+pool_metrics = {
+    "sync": instrument_engine(engine, PoolMetrics("sync", pool_event_recorder("sync"))),
+    "async": instrument_engine(
+        async_engine.sync_engine, PoolMetrics("async", pool_event_recorder("async"))
+    ),
+}
+install_query_counter(engine)
+install_query_counter(async_engine.sync_engine)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Return pool metrics and live gauges for the sync and async engines."""
+
+    return {
+        "sync": pool_metrics["sync"].snapshot(engine.pool),
+        "async": pool_metrics["async"].snapshot(async_engine.sync_engine.pool),
+    }
+
 
 def get_session() -> Generator[Session, None, None]:
     """FastAPI dependency that yields a database session."""
@@ -40,3 +119,10 @@ def session_scope() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields an asyncio database session."""
+
+    async with AsyncSessionLocal() as session:
+        yield session
@@ -1,12 +1,18 @@
 """Authentication related dependencies."""
 
-from fastapi import Depends, Request, status
-from jose import JWTError, jwt
+import secrets
+
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.app.api.deps import get_db
+from backend.app.api.deps import get_async_db, get_db
 from backend.app.core.config import get_settings
+from backend.app.core.security import decode_token
+from backend.app.core.timing import timed
 from backend.app.models.user import User
+from backend.app.services.user_cache import UserSnapshot, get_user_cache
 
 
 class AuthenticationError(Exception):
@@ -28,8 +34,8 @@ def _get_token_from_request(request: Request, *, cookie_name: str) -> str | None
     return None
 
 
-async def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
-    """Validate the access token and load the corresponding user."""
+def _get_user_id_from_request(request: Request) -> int:
+    """Validate the access token on ``request`` and return its user id."""
 
     settings = get_settings()
     token = _get_token_from_request(
@@ -39,12 +45,7 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)) -> U
         raise AuthenticationError("Not authenticated")
 
     try:
-        payload = jwt.decode(
-            token,
-            settings.secret_key,
-            algorithms=[settings.algorithm],
-            options={"verify_aud": False},
-        )
+        payload = decode_token(token)
     except JWTError as exc:  # pragma: no cover - defensive branch
         raise AuthenticationError("Could not validate credentials") from exc
 
@@ -57,13 +58,66 @@ async def get_current_user(request: Request, db: Session = Depends(get_db)) -> U
         raise AuthenticationError("Token subject missing")
 
     try:
-        user_id = int(subject)
+        return int(subject)
     except (TypeError, ValueError) as exc:  # pragma: no cover - defensive branch
         raise AuthenticationError("Token subject invalid") from exc
 
-    user = db.get(User, user_id)
+
+def get_current_user(request: Request, db: Session = Depends(get_db)) -> User:
+    """Validate the access token and load the corresponding user."""
+
+    with timed("auth"):
+        user_id = _get_user_id_from_request(request)
+        user = db.get(User, user_id)
     if user is None or not user.is_active:
         raise AuthenticationError("User not found")
 
     request.state.user = user  # type: ignore[attr-defined]
     return user
+
+
+async def get_current_user_async(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> UserSnapshot:
+    """Asyncio variant of :func:`get_current_user` returning a cached snapshot.
+
+    The user row is only read when the snapshot is missing from the user cache,
+    so on a cache hit the request never checks out a database connection.
+    """
+
+    with timed("auth"):
+        user_id = _get_user_id_from_request(request)
+        cache = get_user_cache()
+        snapshot = await cache.get(user_id)
+        if snapshot is None:
+            user = await db.get(User, user_id)
+            if user is None:
+                raise AuthenticationError("User not found")
+            snapshot = UserSnapshot.from_user(user)
+            await cache.set(snapshot)
+    if not snapshot.is_active:
+        raise AuthenticationError("User not found")
+
+    request.state.user = snapshot  # type: ignore[attr-defined]
+    return snapshot
+
+
+def require_internal_token(request: Request) -> None:
+    """Guard operational endpoints with ``INTERNAL_ENDPOINTS_TOKEN`` when it is set.
+
+    The token is sent as ``Authorization: Bearer <token>``, which Prometheus
+    supports for scrapes. Without a configured token the endpoints rely on
+    being enabled only where the network is trusted.
+    """
+
+    expected = get_settings().internal_endpoints_token
+    if not expected:
+        return
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal endpoint token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
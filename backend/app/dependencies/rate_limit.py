@@ -0,0 +1,75 @@
+"""Rate limiting dependencies for routers and routes.
+
+:func:`rate_limit` builds a dependency from a limit name and a key
+dependency; attach it to a route or a whole router::
+
+    @router.post("/login", dependencies=[Depends(rate_limit("login", login_identity))])
+
+The limit is read from the ``rate_limit_<name>`` setting (e.g. ``10/minute``).
+"""
+
+from typing import Any, Awaitable, Callable, Collection, Optional
+
+from fastapi import Depends, Request
+
+from backend.app.core.config import get_settings
+from backend.app.dependencies.auth import get_current_user_async
+from backend.app.services.rate_limiter import (
+    RateLimitExceededError,
+    get_rate_limiter,
+    parse_rate_limit,
+)
+from backend.app.services.user_cache import UserSnapshot
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def client_ip(request: Request) -> str:
+    """Return the client address; run uvicorn with ``--proxy-headers`` behind a proxy."""
+
+    return request.client.host if request.client else "unknown"
+
+
+async def login_identity(request: Request) -> str:
+    """Key login attempts by client address and the email being tried.
+
+    FastAPI has already parsed the body by the time dependencies run, so
+    ``request.json()`` returns the cached document.
+    """
+
+    try:
+        body = await request.json()
+    except ValueError:
+        body = None
+    email = body.get("email") if isinstance(body, dict) else None
+    return f"{client_ip(request)}:{str(email or '').strip().lower()}"
+
+
+def user_identity(current_user: UserSnapshot = Depends(get_current_user_async)) -> str:
+    return f"user:{current_user.id}"
+
+
+def rate_limit(
+    name: str,
+    key: Callable[..., Any] = client_ip,
+    *,
+    methods: Optional[Collection[str]] = None,
+) -> Callable[..., Awaitable[None]]:
+    """Return a dependency enforcing the ``rate_limit_<name>`` setting per ``key``.
+
+    ``key`` is itself a dependency returning the bucket identity. With
+    ``methods`` only requests using one of them are counted, which lets a
+    router-wide limit cover writes only.
+    """
+
+    async def enforce_rate_limit(request: Request, identity: str = Depends(key)) -> None:
+        if methods is not None and request.method not in methods:
+            return
+        limit = parse_rate_limit(getattr(get_settings(), f"rate_limit_{name}"))
+        if limit is None:
+            return
+        retry_after = await get_rate_limiter().hit(f"{name}:{identity}", limit)
+        if retry_after > 0:
+            raise RateLimitExceededError(retry_after)
+
+    return enforce_rate_limit
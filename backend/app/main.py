@@ -1,16 +1,26 @@
 """Application entrypoint for the FastAPI app."""
 
-from typing import Set
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Set
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from backend.app.api.routes.auth import router as auth_router
-from backend.app.api.routes.todos import router as todos_router
+from backend.app.api.routes.internal import router as internal_router
+from backend.app.api.routes.metrics import router as metrics_router
+from backend.app.api.routes.todos import NEXT_CURSOR_HEADER, router as todos_router
 from backend.app.core.config import get_settings
+from backend.app.core.hashing import HashingOverloadedError, get_password_hasher
+from backend.app.core.prometheus import mark_process_dead, record_auth_event
+from backend.app.db.session import async_engine
 from backend.app.dependencies.auth import AuthenticationError
 from backend.app.middleware.csrf import CSRFMiddleware
+from backend.app.middleware.metrics import MetricsMiddleware
+from backend.app.middleware.profiling import ProfilingMiddleware, install_profiling_hooks
+from backend.app.middleware.query_budget import QueryBudgetMiddleware
+from backend.app.services.rate_limiter import RateLimitExceededError
 
 
 def _build_csrf_exempt_paths(settings) -> Set[str]:
@@ -22,9 +32,19 @@ def _build_csrf_exempt_paths(settings) -> Set[str]:
     return base_paths | prefixed_paths
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    hasher = get_password_hasher()
+    await hasher.warm_up()
+    yield
+    hasher.shutdown()
+    await async_engine.dispose()
+    mark_process_dead()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -32,7 +52,7 @@ def create_app() -> FastAPI:
         allow_credentials=settings.allow_cors_credentials,
         allow_methods=list(settings.allow_cors_methods),
         allow_headers=list(settings.allow_cors_headers),
-        expose_headers=[settings.csrf_header_name],
+        expose_headers=[settings.csrf_header_name, NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
     )
 
     app.add_middleware(
@@ -42,18 +62,65 @@ def create_app() -> FastAPI:
         exempt_paths=_build_csrf_exempt_paths(settings),
     )
 
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+    if settings.query_budget_mode in ("warn", "raise"):
+        app.add_middleware(
+            QueryBudgetMiddleware,
+            mode=settings.query_budget_mode,
+            default_budget=settings.query_budget_default or None,
+            repeat_threshold=settings.query_repeat_threshold,
+        )
+
+    if settings.profiling_enabled:
+        install_profiling_hooks()
+        # Added last so it is outermost and times the whole middleware stack.
+        app.add_middleware(
+            ProfilingMiddleware,
+            slow_threshold=settings.profiling_slow_request_ms / 1000,
+            sample_rate=settings.profiling_sample_rate,
+            output_dir=settings.profiling_output_dir,
+            profiler=settings.profiling_profiler,
+        )
+
     @app.exception_handler(AuthenticationError)
     async def authentication_exception_handler(
         request: Request, exc: AuthenticationError
     ) -> JSONResponse:
+        record_auth_event("access_token", "rejected")
         return JSONResponse(
             status_code=exc.status_code,
             content={"detail": exc.detail},
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    @app.exception_handler(HashingOverloadedError)
+    async def hashing_overloaded_exception_handler(
+        request: Request, exc: HashingOverloadedError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": exc.detail},
+            headers={"Retry-After": "1"},
+        )
+
+    @app.exception_handler(RateLimitExceededError)
+    async def rate_limit_exceeded_exception_handler(
+        request: Request, exc: RateLimitExceededError
+    ) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": exc.detail},
+            headers={"Retry-After": exc.retry_after_header},
+        )
+
     app.include_router(auth_router, prefix=settings.api_prefix)
     app.include_router(todos_router, prefix=settings.api_prefix)
+    if settings.internal_endpoints_enabled:
+        app.include_router(internal_router, prefix=settings.api_prefix)
+    if settings.metrics_enabled:
+        app.include_router(metrics_router)
 
     return app
 
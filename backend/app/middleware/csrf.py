@@ -1,53 +1,72 @@
 """Custom middleware that enforces a simple double-submit CSRF protection."""
 
 import secrets
-from typing import Iterable, Set
+from typing import Iterable, Optional, Set
 
-from fastapi import Request, status
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import JSONResponse, Response
+from fastapi import status
+from starlette.requests import cookie_parser
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
 
 
-class CSRFMiddleware(BaseHTTPMiddleware):
-    """Validate CSRF tokens for state-changing requests."""
+class CSRFMiddleware:
+    """Validate CSRF tokens for state-changing requests.
+
+    Implemented as plain ASGI so safe methods and exempt paths are decided from
+    the raw ``scope`` and responses (including streaming ones) pass through
+    untouched, without the task and memory-stream overhead of
+    ``BaseHTTPMiddleware``.
+    """
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         *,
         header_name: str,
         cookie_name: str,
         exempt_paths: Iterable[str] | None = None,
     ) -> None:
-        super().__init__(app)
+        self.app = app
         self.header_name = header_name
         self.cookie_name = cookie_name
         self.exempt_paths: Set[str] = {self._normalize(path) for path in (exempt_paths or [])}
+        self._header_key = header_name.lower().encode("latin-1")
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        method = request.method.upper()
-        if method in SAFE_METHODS:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requires_check(scope):
+            await self.app(scope, receive, send)
+            return
 
-        path = self._normalize(request.url.path)
-        if path in self.exempt_paths:
-            return await call_next(request)
+        csrf_header: Optional[str] = None
+        cookie_header: Optional[str] = None
+        for key, value in scope["headers"]:
+            if key == self._header_key and csrf_header is None:
+                csrf_header = value.decode("latin-1")
+            elif key == b"cookie" and cookie_header is None:
+                cookie_header = value.decode("latin-1")
+        csrf_cookie = cookie_parser(cookie_header).get(self.cookie_name) if cookie_header else None
 
-        csrf_cookie = request.cookies.get(self.cookie_name)
-        csrf_header = request.headers.get(self.header_name)
         if not csrf_cookie or not csrf_header:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "CSRF token missing"},
             )
-        if not secrets.compare_digest(csrf_cookie, csrf_header):
-            return JSONResponse(
+        elif not secrets.compare_digest(csrf_cookie, csrf_header):
+            response = JSONResponse(
                 status_code=status.HTTP_403_FORBIDDEN,
                 content={"detail": "CSRF token invalid"},
             )
-        return await call_next(request)
+        else:
+            await self.app(scope, receive, send)
+            return
+        await response(scope, receive, send)
+
+    def _requires_check(self, scope: Scope) -> bool:
+        if scope["method"].upper() in SAFE_METHODS:
+            return False
+        return self._normalize(scope["path"]) not in self.exempt_paths
 
     @staticmethod
     def _normalize(path: str) -> str:
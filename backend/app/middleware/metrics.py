@@ -0,0 +1,55 @@
+"""ASGI middleware recording Prometheus request counts and latencies."""
+
+import time
+from typing import Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.prometheus import HTTP_REQUEST_DURATION, HTTP_REQUESTS
+
+
+class MetricsMiddleware:
+    """Count requests and observe their duration by route template.
+
+    Labels use the matched route's template (``/api/todos/{todo_id}``), never
+    the raw path, so cardinality stays bounded. Label children are cached per
+    route, which keeps the per-request cost to two metric updates.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._durations: Dict[Tuple[str, str], object] = {}
+        self._counters: Dict[Tuple[str, str, int], object] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._observe(scope, status_code, time.perf_counter() - start)
+
+    def _observe(self, scope: Scope, status_code: int, seconds: float) -> None:
+        route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+        method = scope["method"]
+        duration = self._durations.get((method, route))
+        if duration is None:
+            duration = self._durations[(method, route)] = HTTP_REQUEST_DURATION.labels(method, route)
+        counter = self._counters.get((method, route, status_code))
+        if counter is None:
+            counter = self._counters[(method, route, status_code)] = HTTP_REQUESTS.labels(
+                method, route, str(status_code)
+            )
+        duration.observe(seconds)  # type: ignore[attr-defined]
+        counter.inc()  # type: ignore[attr-defined]
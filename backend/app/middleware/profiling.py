@@ -0,0 +1,245 @@
+"""Opt-in request profiling: phase timings, ``Server-Timing`` and slow-request profiles."""
+
+import cProfile
+import logging
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import fastapi.routing
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.metrics import Histogram
+from backend.app.core.timing import (
+    RequestTimings,
+    reset_request_timings,
+    start_request_timings,
+    timed,
+)
+from backend.app.db.query_metrics import instrument_queries
+from backend.app.db.session import async_engine, engine
+
+try:  # pragma: no cover - optional dependency
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+except ImportError:  # pragma: no cover
+    _PyinstrumentProfiler = None
+
+logger = logging.getLogger(__name__)
+
+# Statement counts per request; anything in the upper buckets is an N+1 suspect.
+SQL_STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+PHASES = ("auth", "db", "sql", "serialize")
+
+
+class RouteStats:
+    """Histograms of the total duration, each phase and the SQL statement count."""
+
+    def __init__(self) -> None:
+        self.total = Histogram()
+        self.phases: Dict[str, Histogram] = {phase: Histogram() for phase in PHASES}
+        self.sql_statements = Histogram(SQL_STATEMENT_BUCKETS)
+
+    def observe(self, total: float, timings: RequestTimings) -> None:
+        self.total.observe(total)
+        for phase, histogram in self.phases.items():
+            histogram.observe(timings.phases.get(phase, 0.0))
+        self.sql_statements.observe(timings.sql_statements)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": self.total.snapshot(),
+            "phase_seconds": {phase: hist.snapshot() for phase, hist in self.phases.items()},
+            "sql_statements": self.sql_statements.snapshot(),
+        }
+
+
+class ProfilingStats:
+    """Per-route aggregates keyed by ``"METHOD /route/{template}"``."""
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+        self.profiles_written = 0
+
+    def observe(self, route: str, total: float, timings: RequestTimings) -> None:
+        stats = self._routes.get(route)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(route, RouteStats())
+        stats.observe(total, timings)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = dict(self._routes)
+        return {
+            "routes": {route: stats.snapshot() for route, stats in sorted(routes.items())},
+            "profiles_written": self.profiles_written,
+        }
+
+
+profiling_stats = ProfilingStats()
+_installed = False
+
+
+def install_profiling_hooks() -> None:
+    """Time SQL statements of both engines and FastAPI's response serialization.
+
+    Idempotent; only called when profiling is enabled, so the hooks cost
+    nothing otherwise. ``serialize_response`` is looked up as a module global
+    by FastAPI's request handler, which is what makes wrapping it effective.
+    """
+
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    instrument_queries(engine)
+    instrument_queries(async_engine.sync_engine)
+
+    serialize_response = fastapi.routing.serialize_response
+
+    async def timed_serialize_response(**kwargs: Any) -> Any:
+        with timed("serialize"):
+            return await serialize_response(**kwargs)
+
+    fastapi.routing.serialize_response = timed_serialize_response  # type: ignore[assignment]
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope['method']} {path}"
+
+
+def server_timing(total: float, timings: RequestTimings) -> str:
+    """Format ``timings`` as a ``Server-Timing`` header value (milliseconds)."""
+
+    entries = [
+        f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in timings.phases.items()
+    ]
+    if timings.sql_statements:
+        entries.append(f'sql-count;desc="{timings.sql_statements}"')
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class ProfilingMiddleware:
+    """Time requests by phase and profile a sample of them.
+
+    Every HTTP request gets a :class:`RequestTimings` that dependencies, the
+    SQL cursor events and serialization add to. The response carries a
+    ``Server-Timing`` header and the numbers feed per-route histograms.
+
+    With ``sample_rate`` > 0 that fraction of requests runs under a profiler
+    (cProfile, or pyinstrument when installed and selected); the profile is
+    written to ``output_dir`` only when the request took longer than
+    ``slow_threshold``. One request is profiled at a time, and since cProfile
+    sees every coroutine of the thread, its profiles include concurrent work.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        slow_threshold: float,
+        sample_rate: float = 0.0,
+        output_dir: str = "profiles",
+        profiler: str = "cprofile",
+        stats: ProfilingStats = profiling_stats,
+    ) -> None:
+        self.app = app
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir)
+        self.use_pyinstrument = profiler == "pyinstrument" and _PyinstrumentProfiler is not None
+        if profiler == "pyinstrument" and _PyinstrumentProfiler is None:
+            logger.warning("pyinstrument is not installed; falling back to cProfile")
+        self.stats = stats
+        self._profiling = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request_timings()
+        start = time.perf_counter()
+        streaming = False
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal streaming
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(time.perf_counter() - start, timings))
+                streaming = headers.get("content-type", "").startswith("text/event-stream")
+            await send(message)
+
+        profiler = self._start_profiler()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - start
+            reset_request_timings(token)
+            route = _route_template(scope)
+            if profiler is not None:
+                self._finish_profiler(profiler, route, 0.0 if streaming else total)
+            # Event streams stay open for minutes; their duration says nothing.
+            if not streaming:
+                self._record(route, total, timings)
+
+    def _record(self, route: str, total: float, timings: RequestTimings) -> None:
+        self.stats.observe(route, total, timings)
+        if total >= self.slow_threshold:
+            logger.warning(
+                "Slow request %s took %.1fms (%s)", route, total * 1000, server_timing(total, timings)
+            )
+
+    def _start_profiler(self) -> Optional[Any]:
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        if not self._profiling.acquire(blocking=False):
+            return None
+        try:
+            if self.use_pyinstrument:
+                profiler = _PyinstrumentProfiler(async_mode="enabled")
+                profiler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+        except (RuntimeError, ValueError):
+            # Another profiler is already attached to this thread.
+            self._profiling.release()
+            return None
+        return profiler
+
+    def _finish_profiler(self, profiler: Any, route: str, total: float) -> None:
+        try:
+            if self.use_pyinstrument:
+                profiler.stop()
+            else:
+                profiler.disable()
+            if total >= self.slow_threshold:
+                self._write_profile(profiler, route, total)
+        finally:
+            self._profiling.release()
+
+    def _write_profile(self, profiler: Any, route: str, total: float) -> None:
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-")
+        name = f"{int(time.time() * 1000)}-{slug}-{total * 1000:.0f}ms"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            if self.use_pyinstrument:
+                path = self.output_dir / f"{name}.html"
+                path.write_text(profiler.output_html(), encoding="utf-8")
+            else:
+                path = self.output_dir / f"{name}.prof"
+                profiler.dump_stats(str(path))
+        except OSError:
+            logger.warning("Writing the profile of %s failed", route, exc_info=True)
+            return
+        self.stats.profiles_written += 1
+        logger.info("Wrote profile of slow request %s to %s", route, path)
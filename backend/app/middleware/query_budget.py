@@ -0,0 +1,79 @@
+"""ASGI middleware that counts each request's SQL statements against its route budget."""
+
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.db.query_counter import (
+    QueryCounter,
+    check_query_budget,
+    count_queries,
+    declared_budget,
+)
+
+
+class QueryBudgetMiddleware:
+    """Check every request's statement count against its route's budget.
+
+    The budget comes from :func:`~backend.app.db.query_counter.query_budget`
+    on the endpoint, falling back to ``default_budget`` (``None`` means
+    unbounded). The check runs when the last body chunk is sent, with the
+    response start held back until the first chunk: in ``raise`` mode a
+    violation of a regular response therefore becomes a ``500`` (which the
+    test client re-raises) instead of following a ``2xx``. Streaming
+    responses have started by then and can only be cut short. ``warn`` only
+    logs.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        mode: str = "warn",
+        default_budget: Optional[int] = None,
+        repeat_threshold: int = 0,
+    ) -> None:
+        self.app = app
+        self.mode = mode
+        self.default_budget = default_budget
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        checked = False
+
+        async def send_checked(message: Message) -> None:
+            nonlocal start, checked
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if (
+                message["type"] == "http.response.body"
+                and not message.get("more_body", False)
+                and not checked
+            ):
+                checked = True
+                self._check(scope, counter)
+            if start is not None:
+                await send(start)
+                start = None
+            await send(message)
+
+        with count_queries() as counter:
+            await self.app(scope, receive, send_checked)
+        if start is not None:
+            await send(start)
+
+    def _check(self, scope: Scope, counter: QueryCounter) -> None:
+        route = scope.get("route")
+        budget = declared_budget(getattr(route, "endpoint", None))
+        if budget is None:
+            budget = self.default_budget
+        counter.label = f"{scope['method']} {getattr(route, 'path', None) or scope['path']}"
+        check_query_budget(
+            counter, budget, mode=self.mode, repeat_threshold=self.repeat_threshold
+        )
@@ -0,0 +1,38 @@
+"""Ledger of reminder notifications that have already been sent."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class TodoNotification(Base):
+    """Records that a reminder was sent for a todo's ``due_date``.
+
+    The reminder window is identified by the due date itself, so moving a
+    todo's deadline makes it eligible for a fresh reminder.
+    """
+
+    __tablename__ = "todo_notifications"
+    __table_args__ = (
+        UniqueConstraint("todo_id", "due_date", name="uq_todo_notifications_todo_due"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    todo_id = Column(
+        Integer,
+        ForeignKey("todo_items.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    due_date = Column(DateTime(timezone=True), nullable=False)
+    sent_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=func.now(),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"TodoNotification(todo_id={self.todo_id!r}, due_date={self.due_date!r})"
@@ -0,0 +1,42 @@
+"""Refresh token families of the SQL refresh token store."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class RefreshTokenFamily(Base):
+    """One login session: the chain of refresh tokens rotated from a sign-in.
+
+    Only the newest token's ``jti`` is stored, with the one it replaced and
+    when. Presenting the replaced token shortly after the rotation is a
+    concurrent refresh (two tabs, a retry); any other older token means the
+    chain was copied, and the whole family is revoked. Rows past
+    ``expires_at`` are ignored and pruned by a periodic task.
+    """
+
+    __tablename__ = "refresh_token_families"
+
+    id = Column(String(32), primary_key=True)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    jti = Column(String(32), nullable=False)
+    previous_jti = Column(String(32), nullable=True)
+    rotated_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=func.now(),
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"RefreshTokenFamily(id={self.id!r}, user_id={self.user_id!r})"
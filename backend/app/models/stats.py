@@ -0,0 +1,28 @@
+"""Per-user todo counters maintained by the todo service."""
+
+from sqlalchemy import Column, Enum as SAEnum, ForeignKey, Integer
+
+from . import Base
+from .todo import TodoStatus
+
+
+class TodoStatusCount(Base):
+    """Number of a user's todos in one status.
+
+    Rows are adjusted in the same transaction as every todo write, so reading
+    a user's statistics touches one row per status instead of their todos.
+    The reconcile task repairs any drift.
+    """
+
+    __tablename__ = "todo_status_counts"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status = Column(SAEnum(TodoStatus, name="todo_status"), primary_key=True)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"TodoStatusCount(user_id={self.user_id!r}, status={self.status!r}, count={self.count!r})"
@@ -3,7 +3,16 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, DateTime, Enum as SAEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum as SAEnum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -22,6 +31,12 @@ class TodoItem(Base):
     """Represents a todo item belonging to a user."""
 
     __tablename__ = "todo_items"
+    __table_args__ = (
+        Index("ix_todo_items_user_status", "user_id", "status"),
+        Index("ix_todo_items_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_todo_items_user_updated_id", "user_id", "updated_at", "id"),
+        Index("ix_todo_items_user_due_date", "user_id", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -33,7 +48,7 @@ class TodoItem(Base):
         server_default=TodoStatus.PENDING.value,
         index=True,
     )
-    due_date = Column(DateTime(timezone=True), nullable=True)
+    due_date = Column(DateTime(timezone=True), nullable=True, index=True)
     created_at = Column(
         DateTime(timezone=True),
         nullable=False,
@@ -0,0 +1,37 @@
+"""Log of deleted todo items consumed by delta sync clients."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.sql import func
+
+from . import Base
+
+
+class TodoTombstone(Base):
+    """Records that a todo was deleted so syncing clients can drop it too.
+
+    Rows are written in the same transaction as the delete and pruned after
+    the sync token retention period.
+    """
+
+    __tablename__ = "todo_tombstones"
+    __table_args__ = (Index("ix_todo_tombstones_user_id_id", "user_id", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    todo_id = Column(Integer, nullable=False)
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    deleted_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        server_default=func.now(),
+        index=True,
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - debug helper
+        return f"TodoTombstone(todo_id={self.todo_id!r}, user_id={self.user_id!r})"
@@ -1,12 +1,15 @@
 """Pydantic schemas for todo resources."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
 from backend.app.models.todo import TodoStatus
 
+# Columns an update may omit but must not set to ``null``.
+NON_NULLABLE_FIELDS = ("title", "status")
+
 
 class TodoBase(BaseModel):
     """Shared attributes for todo items."""
@@ -31,6 +34,18 @@ class TodoUpdate(BaseModel):
     status: Optional[TodoStatus] = None
     due_date: Optional[datetime] = None
 
+    def null_fields(self) -> List[str]:
+        """Return the non-nullable fields this update explicitly sets to ``null``."""
+
+        fields_set = getattr(self, "model_fields_set", None)
+        if fields_set is None:
+            fields_set = self.__fields_set__
+        return [
+            field
+            for field in NON_NULLABLE_FIELDS
+            if field in fields_set and getattr(self, field) is None
+        ]
+
 
 class TodoRead(TodoBase):
     """Schema returned when reading todo items."""
@@ -42,3 +57,62 @@ class TodoRead(TodoBase):
 
     class Config:
         orm_mode = True
+
+
+class TodoBatchCreate(BaseModel):
+    """Payload for creating several todo items at once."""
+
+    items: List[TodoCreate]
+
+
+class TodoBatchUpdateItem(TodoUpdate):
+    """Partial update of a single todo item inside a batch."""
+
+    id: int
+
+
+class TodoBatchUpdate(BaseModel):
+    """Payload for updating several todo items at once."""
+
+    items: List[TodoBatchUpdateItem]
+
+
+class TodoBatchDelete(BaseModel):
+    """Payload for deleting several todo items at once."""
+
+    ids: List[int]
+
+
+class TodoBatchItemResult(BaseModel):
+    """Outcome of one item of a batch request, in request order."""
+
+    index: int
+    id: Optional[int] = None
+    ok: bool
+    error: Optional[str] = None
+    todo: Optional[TodoRead] = None
+
+
+class TodoBatchResult(BaseModel):
+    """Per-item results of a batch request."""
+
+    results: List[TodoBatchItemResult]
+    succeeded: int
+    failed: int
+
+
+class TodoChanges(BaseModel):
+    """Delta sync page returned by ``GET /todos/changes``."""
+
+    changed: List[TodoRead]
+    deleted: List[int]
+    next_token: str
+    has_more: bool
+
+
+class TodoStats(BaseModel):
+    """Todo counts of the current user returned by ``GET /todos/stats``."""
+
+    total: int
+    by_status: Dict[TodoStatus, int]
+    overdue: int
@@ -0,0 +1,233 @@
+"""Token bucket rate limiting with per-process and Redis backends.
+
+A limit such as ``10/minute`` is a bucket holding up to 10 tokens that refills
+at 10 tokens per minute; every request takes one token, so short bursts are
+allowed while the sustained rate is capped. The Redis backend keeps each
+bucket in a hash updated by one Lua script, which makes a check atomic across
+workers and costs a single round trip. Keys that were just refused are
+remembered locally until their retry time, so a client hammering a blocked
+key costs no Redis round trip at all.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Refills the bucket in KEYS[1] for the time elapsed (by the Redis clock, so
+# all workers agree) and takes a token. ARGV: capacity, tokens per second.
+# Returns the seconds until a token is available, 0 when one was taken.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RateLimit(NamedTuple):
+    """``capacity`` requests per ``period`` seconds."""
+
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+@lru_cache()
+def parse_rate_limit(spec: str) -> Optional[RateLimit]:
+    """Parse ``"<count>/<second|minute|hour|day>"``; empty or ``0`` disables the limit."""
+
+    spec = spec.strip()
+    if not spec or spec == "0":
+        return None
+    count, _, period = spec.partition("/")
+    try:
+        return RateLimit(int(count), _PERIODS[period.strip().lower().rstrip("s")])
+    except (KeyError, ValueError) as exc:
+        raise ValueError(f"Invalid rate limit {spec!r}; expected e.g. '10/minute'.") from exc
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a client used up its bucket; answered with ``429`` and ``Retry-After``."""
+
+    def __init__(
+        self, retry_after: float, detail: str = "Too many requests, try again later."
+    ) -> None:
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimiter:
+    """Limiter that allows everything; used when rate limiting is disabled."""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        self.allowed = 0
+        self.rejected = 0
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        """Take a token for ``key``; return 0, or the seconds to wait when refused."""
+
+        return 0.0
+
+    def _record(self, retry_after: float) -> float:
+        if retry_after > 0:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+        return retry_after
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self).__name__,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """Buckets kept in this process; each worker enforces the limit on its own.
+
+    At most ``max_keys`` buckets are kept; the least recently used are
+    dropped, which only ever errs on the side of allowing a request.
+    """
+
+    enabled = True
+
+    def __init__(self, *, max_keys: int) -> None:
+        super().__init__()
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(limit.capacity), now))
+            tokens = min(float(limit.capacity), tokens + (now - updated) * limit.rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / limit.rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return self._record(retry_after)
+
+    def stats(self) -> Dict[str, object]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(keys=len(self._buckets), max_keys=self.max_keys)
+        return stats
+
+
+class RedisRateLimiter(RateLimiter):
+    """Buckets shared by every worker through Redis.
+
+    Redis failures are logged and the request is allowed; an outage of the
+    limiter must not take authentication down with it.
+    """
+
+    enabled = True
+    key_prefix = "rate-limit:"
+
+    def __init__(self, *, max_keys: int) -> None:
+        super().__init__()
+        self.max_keys = max_keys
+        self.local_rejections = 0
+        self._blocked: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._script = None
+
+    def _blocked_for(self, key: str, now: float) -> float:
+        with self._lock:
+            until = self._blocked.get(key)
+            if until is None:
+                return 0.0
+            if until <= now:
+                del self._blocked[key]
+                return 0.0
+            return until - now
+
+    def _block(self, key: str, until: float) -> None:
+        with self._lock:
+            self._blocked[key] = until
+            self._blocked.move_to_end(key)
+            while len(self._blocked) > self.max_keys:
+                self._blocked.popitem(last=False)
+
+    async def hit(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        retry_after = self._blocked_for(key, now)
+        if retry_after > 0:
+            self.local_rejections += 1
+            return self._record(retry_after)
+        if self._script is None:
+            self._script = get_redis().register_script(_TOKEN_BUCKET_SCRIPT)
+        try:
+            result = await self._script(
+                keys=[f"{self.key_prefix}{key}"], args=[limit.capacity, repr(limit.rate)]
+            )
+        except RedisError:
+            logger.warning("Rate limit check failed for %s", key, exc_info=True)
+            return self._record(0.0)
+        retry_after = float(result)
+        if retry_after > 0:
+            self._block(key, now + retry_after)
+        return self._record(retry_after)
+
+    def stats(self) -> Dict[str, object]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(blocked_keys=len(self._blocked), local_rejections=self.local_rejections)
+        return stats
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Return the configured rate limiter backend."""
+
+    settings = get_settings()
+    backend = settings.rate_limit_backend.lower()
+    if backend == "memory":
+        return InMemoryRateLimiter(max_keys=settings.rate_limit_max_keys)
+    if backend == "redis":
+        return RedisRateLimiter(max_keys=settings.rate_limit_max_keys)
+    return RateLimiter()
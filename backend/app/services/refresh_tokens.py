@@ -0,0 +1,339 @@
+"""Server-side state of refresh tokens: families, rotation and revocation.
+
+Every sign-in starts a *family*; its refresh tokens carry the family id
+(``fid``) and a token id (``jti``) and the store keeps only the newest
+``jti`` of each family. Refreshing rotates it, so presenting an older token
+means it was copied: the whole family is revoked and both the thief and the
+user have to sign in again. The token just replaced is still accepted for
+``refresh_token_reuse_grace_seconds`` after the rotation and answered with
+the family's current token, so two tabs or a retried request refreshing with
+the same cookie do not log the user out. Every check is a lookup by key, and
+entries expire with the refresh token lifetime, so the store stays
+proportional to the number of live sessions.
+
+Logging out revokes one family; logging out everywhere marks the user's
+families created before now as revoked (Redis) or deletes them by user (SQL).
+Refresh tokens issued before families existed are adopted once into a family
+named after the token; presenting such a token again revokes that family.
+"""
+
+import logging
+import secrets
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis
+from backend.app.models.refresh_token import RefreshTokenFamily
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] family hash; ARGV: jti, lifetime in ms. The creation time comes from
+# the Redis clock, which "log out everywhere" compares against.
+_ISSUE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('HSET', KEYS[1], 'jti', ARGV[1], 'created', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return now
+"""
+
+# KEYS[1] family hash; ARGV: jti, lifetime in ms. Like _ISSUE_SCRIPT, but a
+# family that already exists was adopted before, so it is revoked instead.
+_ADOPT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('DEL', KEYS[1])
+    return 'reused'
+end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('HSET', KEYS[1], 'jti', ARGV[1], 'created', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[2])
+return 'ok'
+"""
+
+# KEYS[1] family hash, KEYS[2] the user's revoked-before marker;
+# ARGV: presented jti, new jti, lifetime in ms, reuse grace in ms.
+# Returns {outcome, jti of the token to hand out}.
+_ROTATE_SCRIPT = """
+local family = redis.call('HMGET', KEYS[1], 'jti', 'created', 'previous', 'rotated')
+if not family[1] then
+    return {'revoked'}
+end
+local revoked_before = redis.call('GET', KEYS[2])
+if revoked_before and tonumber(family[2]) <= tonumber(revoked_before) then
+    redis.call('DEL', KEYS[1])
+    return {'revoked'}
+end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+if family[1] == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'jti', ARGV[2], 'previous', ARGV[1], 'rotated', now)
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+    return {'ok', ARGV[2]}
+end
+if family[3] == ARGV[1] and now - tonumber(family[4]) <= tonumber(ARGV[4]) then
+    return {'ok', family[1]}
+end
+redis.call('DEL', KEYS[1])
+return {'reused'}
+"""
+
+# KEYS[1] the user's revoked-before marker; ARGV: lifetime in ms. Families
+# outlive the marker only if they were rotated after it, i.e. created later.
+_REVOKE_ALL_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('SET', KEYS[1], now, 'PX', ARGV[1])
+return now
+"""
+
+
+def _new_id() -> str:
+    return secrets.token_hex(16)
+
+
+def _text(value: object) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class RefreshTokenRejectedError(Exception):
+    """Raised when a refresh token's family was revoked, expired or its token reused."""
+
+    def __init__(self, detail: str, *, reused: bool = False) -> None:
+        super().__init__(detail)
+        self.detail = detail
+        self.reused = reused
+
+
+class RefreshTokenStore:
+    """Store that keeps nothing: every validly signed refresh token is accepted.
+
+    Methods take the request's session so the SQL store can use it; other
+    backends ignore it.
+    """
+
+    enabled = False
+
+    def __init__(self, *, lifetime: timedelta, reuse_grace: timedelta) -> None:
+        self.lifetime = lifetime
+        self.reuse_grace = reuse_grace
+
+    async def issue(self, db: AsyncSession, user_id: int) -> Tuple[str, str]:
+        """Start a family for a new sign-in; return its ``(fid, jti)``."""
+
+        return _new_id(), _new_id()
+
+    async def adopt(self, db: AsyncSession, user_id: int, family: str) -> str:
+        """Start ``family`` for a token issued before families existed; return its ``jti``.
+
+        Raises :class:`RefreshTokenRejectedError` (and revokes the family)
+        when the family was adopted before, i.e. the old token is replayed.
+        """
+
+        return _new_id()
+
+    async def rotate(self, db: AsyncSession, user_id: int, family: str, jti: str) -> str:
+        """Replace ``jti`` as the family's current token; return the ``jti`` to hand out.
+
+        Within the reuse grace window the token just replaced is answered with
+        the current ``jti`` instead. Raises :class:`RefreshTokenRejectedError`
+        when the family is gone or ``jti`` is any other token (which also
+        revokes the family).
+        """
+
+        return _new_id()
+
+    async def revoke(self, db: AsyncSession, user_id: int, family: str) -> None:
+        """Revoke one family (log out of one session)."""
+
+        return None
+
+    async def revoke_all(self, db: AsyncSession, user_id: int) -> None:
+        """Revoke every family of the user (log out everywhere)."""
+
+        return None
+
+
+class SqlRefreshTokenStore(RefreshTokenStore):
+    """Families kept in the ``refresh_token_families`` table.
+
+    Rotation is one conditional ``UPDATE`` by primary key; a second lookup
+    only runs for tokens that are not the current one. Expired rows are ignored and removed by
+    ``prune_refresh_token_families``.
+    """
+
+    enabled = True
+
+    async def issue(self, db: AsyncSession, user_id: int) -> Tuple[str, str]:
+        family, jti = _new_id(), _new_id()
+        await db.execute(
+            insert(RefreshTokenFamily).values(
+                id=family,
+                user_id=user_id,
+                jti=jti,
+                expires_at=datetime.utcnow() + self.lifetime,
+            )
+        )
+        await db.commit()
+        return family, jti
+
+    async def adopt(self, db: AsyncSession, user_id: int, family: str) -> str:
+        jti = _new_id()
+        try:
+            await db.execute(
+                insert(RefreshTokenFamily).values(
+                    id=family,
+                    user_id=user_id,
+                    jti=jti,
+                    expires_at=datetime.utcnow() + self.lifetime,
+                )
+            )
+        except IntegrityError:
+            await db.rollback()
+            await self.revoke(db, user_id, family)
+            raise RefreshTokenRejectedError("Refresh token reused", reused=True) from None
+        await db.commit()
+        return jti
+
+    async def rotate(self, db: AsyncSession, user_id: int, family: str, jti: str) -> str:
+        now = datetime.utcnow()
+        new_jti = _new_id()
+        current = (
+            RefreshTokenFamily.id == family,
+            RefreshTokenFamily.user_id == user_id,
+            RefreshTokenFamily.expires_at > now,
+        )
+        result = await db.execute(
+            update(RefreshTokenFamily)
+            .where(*current, RefreshTokenFamily.jti == jti)
+            .values(
+                jti=new_jti,
+                previous_jti=jti,
+                rotated_at=now,
+                expires_at=now + self.lifetime,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            await db.commit()
+            return new_jti
+        in_grace = and_(
+            RefreshTokenFamily.previous_jti == jti,
+            RefreshTokenFamily.rotated_at >= now - self.reuse_grace,
+        )
+        row = (
+            await db.execute(
+                select(RefreshTokenFamily.jti, in_grace.label("in_grace")).where(*current)
+            )
+        ).first()
+        if row is None:
+            await db.rollback()
+            raise RefreshTokenRejectedError("Refresh token revoked")
+        if row.in_grace:
+            # Commit rather than roll back: a rollback would expire the caller's user.
+            await db.commit()
+            return row.jti
+        await db.execute(delete(RefreshTokenFamily).where(RefreshTokenFamily.id == family))
+        await db.commit()
+        raise RefreshTokenRejectedError("Refresh token reused", reused=True)
+
+    async def revoke(self, db: AsyncSession, user_id: int, family: str) -> None:
+        await db.execute(
+            delete(RefreshTokenFamily).where(
+                RefreshTokenFamily.id == family, RefreshTokenFamily.user_id == user_id
+            )
+        )
+        await db.commit()
+
+    async def revoke_all(self, db: AsyncSession, user_id: int) -> None:
+        await db.execute(delete(RefreshTokenFamily).where(RefreshTokenFamily.user_id == user_id))
+        await db.commit()
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """Families kept in Redis hashes that expire with the refresh token.
+
+    Each operation is one command or script call. A user's keys share a hash
+    tag, so the scripts also work on Redis Cluster. Errors propagate: a store
+    that cannot be reached must not let refresh tokens through.
+    """
+
+    enabled = True
+    key_prefix = "refresh:"
+
+    def __init__(self, *, lifetime: timedelta, reuse_grace: timedelta) -> None:
+        super().__init__(lifetime=lifetime, reuse_grace=reuse_grace)
+        self._lifetime_ms = int(lifetime.total_seconds() * 1000)
+        self._grace_ms = int(reuse_grace.total_seconds() * 1000)
+        self._scripts: dict = {}
+
+    def _family_key(self, user_id: int, family: str) -> str:
+        return f"{self.key_prefix}{{{user_id}}}:family:{family}"
+
+    def _revoked_before_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{{{user_id}}}:revoked-before"
+
+    def _script(self, source: str):  # type: ignore[no-untyped-def]
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = get_redis().register_script(source)
+        return script
+
+    async def issue(self, db: AsyncSession, user_id: int) -> Tuple[str, str]:
+        family, jti = _new_id(), _new_id()
+        await self._script(_ISSUE_SCRIPT)(
+            keys=[self._family_key(user_id, family)], args=[jti, self._lifetime_ms]
+        )
+        return family, jti
+
+    async def adopt(self, db: AsyncSession, user_id: int, family: str) -> str:
+        jti = _new_id()
+        outcome = await self._script(_ADOPT_SCRIPT)(
+            keys=[self._family_key(user_id, family)], args=[jti, self._lifetime_ms]
+        )
+        if outcome not in (b"ok", "ok"):
+            raise RefreshTokenRejectedError("Refresh token reused", reused=True)
+        return jti
+
+    async def rotate(self, db: AsyncSession, user_id: int, family: str, jti: str) -> str:
+        result = await self._script(_ROTATE_SCRIPT)(
+            keys=[self._family_key(user_id, family), self._revoked_before_key(user_id)],
+            args=[jti, _new_id(), self._lifetime_ms, self._grace_ms],
+        )
+        outcome = _text(result[0])
+        if outcome == "ok":
+            return _text(result[1])
+        if outcome == "reused":
+            raise RefreshTokenRejectedError("Refresh token reused", reused=True)
+        raise RefreshTokenRejectedError("Refresh token revoked")
+
+    async def revoke(self, db: AsyncSession, user_id: int, family: str) -> None:
+        await get_redis().delete(self._family_key(user_id, family))
+
+    async def revoke_all(self, db: AsyncSession, user_id: int) -> None:
+        await self._script(_REVOKE_ALL_SCRIPT)(
+            keys=[self._revoked_before_key(user_id)], args=[self._lifetime_ms]
+        )
+
+
+@lru_cache()
+def get_refresh_token_store() -> RefreshTokenStore:
+    """Return the configured refresh token store."""
+
+    settings = get_settings()
+    options = {
+        "lifetime": timedelta(days=settings.refresh_token_expire_days),
+        "reuse_grace": timedelta(seconds=settings.refresh_token_reuse_grace_seconds),
+    }
+    backend = settings.refresh_token_store_backend.lower()
+    if backend == "redis":
+        return RedisRefreshTokenStore(**options)
+    if backend == "sql":
+        return SqlRefreshTokenStore(**options)
+    return RefreshTokenStore(**options)
@@ -0,0 +1,186 @@
+"""Timer wheel of pending todo reminders kept in a Redis sorted set.
+
+Each open todo with a future due date has one member (its id) scored with the
+Unix time its reminder should go out, ``reminder_lead_hours`` before the due
+date. Re-adding a todo overwrites its score, so rescheduling and revoking are
+single ``ZADD``/``ZREM`` calls. The dispatcher pops members that came due and
+hands them to Celery; the task re-reads each todo and the notification ledger,
+so entries left behind by a failed revoke are harmless.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis, get_sync_redis
+from backend.app.models.todo import TodoStatus
+
+logger = logging.getLogger(__name__)
+
+# Pops up to ARGV[2] members scored at or before ARGV[1]; atomic, so several
+# dispatchers never hand out the same reminder.
+_POP_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+
+def _timestamp(value: datetime) -> float:
+    # Naive datetimes are UTC throughout the application.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ReminderScheduler:
+    """Scheduler that keeps nothing; used when the timer wheel is disabled."""
+
+    enabled = False
+
+    def __init__(self, *, lead: timedelta) -> None:
+        self.lead = lead
+
+    def plan(self, todos: Iterable) -> Tuple[Dict[str, float], List[str]]:  # type: ignore[type-arg]
+        """Split ``todos`` into ``{id: fire_at}`` to schedule and ids to revoke.
+
+        ``todos`` may be ORM objects or rows with ``id``, ``status`` and
+        ``due_date``. Completed todos and todos already past due are revoked.
+        """
+
+        now = time.time()
+        schedule: Dict[str, float] = {}
+        revoke: List[str] = []
+        for todo in todos:
+            member = str(todo.id)
+            if todo.due_date is None or todo.status == TodoStatus.COMPLETED:
+                revoke.append(member)
+                continue
+            due = _timestamp(todo.due_date)
+            if due <= now:
+                revoke.append(member)
+            else:
+                schedule[member] = due - self.lead.total_seconds()
+        return schedule, revoke
+
+    async def schedule(self, todos: Iterable) -> None:  # type: ignore[type-arg]
+        """Schedule, reschedule or revoke reminders to match ``todos``."""
+
+        return None
+
+    async def cancel(self, todo_ids: Sequence[int]) -> None:
+        """Revoke the reminders of deleted todos."""
+
+        return None
+
+    def schedule_sync(self, todos: Iterable) -> None:  # type: ignore[type-arg]
+        """Blocking variant of :meth:`schedule` for Celery tasks."""
+
+        return None
+
+    def pop_due(self, now: float, limit: int) -> List[int]:
+        """Remove and return up to ``limit`` todo ids whose reminder is due at ``now``."""
+
+        return []
+
+    def requeue(self, todo_ids: Sequence[int], fire_at: float) -> None:
+        """Put popped reminders back, e.g. after handing them to Celery failed."""
+
+        return None
+
+
+class RedisReminderScheduler(ReminderScheduler):
+    """Timer wheel shared by the API workers and the dispatcher through Redis.
+
+    Redis failures are ignored so writes never fail because of a reminder;
+    the first one of an outage is logged with its traceback, the rest only at
+    debug level. ``schedule_pending_reminders`` refills the wheel.
+    """
+
+    enabled = True
+    key = "todo-reminders:due"
+
+    def __init__(self, *, lead: timedelta) -> None:
+        super().__init__(lead=lead)
+        self._failing = False
+
+    def _failed(self, action: str) -> None:
+        if self._failing:
+            logger.debug("%s todo reminders failed", action, exc_info=True)
+            return
+        self._failing = True
+        logger.warning(
+            "%s todo reminders failed; further Redis errors are logged at debug level "
+            "until it recovers",
+            action,
+            exc_info=True,
+        )
+
+    def _succeeded(self) -> None:
+        if self._failing:
+            self._failing = False
+            logger.info("Reminder scheduling recovered")
+
+    async def schedule(self, todos: Iterable) -> None:  # type: ignore[type-arg]
+        schedule, revoke = self.plan(todos)
+        pipe = get_redis().pipeline(transaction=False)
+        if schedule:
+            pipe.zadd(self.key, schedule)
+        if revoke:
+            pipe.zrem(self.key, *revoke)
+        try:
+            await pipe.execute()
+        except RedisError:
+            self._failed("Scheduling")
+        else:
+            self._succeeded()
+
+    async def cancel(self, todo_ids: Sequence[int]) -> None:
+        if not todo_ids:
+            return
+        try:
+            await get_redis().zrem(self.key, *map(str, todo_ids))
+        except RedisError:
+            self._failed("Revoking")
+        else:
+            self._succeeded()
+
+    def schedule_sync(self, todos: Iterable) -> None:  # type: ignore[type-arg]
+        schedule, revoke = self.plan(todos)
+        pipe = get_sync_redis().pipeline(transaction=False)
+        if schedule:
+            pipe.zadd(self.key, schedule)
+        if revoke:
+            pipe.zrem(self.key, *revoke)
+        try:
+            pipe.execute()
+        except RedisError:
+            self._failed("Scheduling")
+        else:
+            self._succeeded()
+
+    def pop_due(self, now: float, limit: int) -> List[int]:
+        ids = get_sync_redis().eval(_POP_DUE_SCRIPT, 1, self.key, now, limit)
+        return [int(todo_id) for todo_id in ids]
+
+    def requeue(self, todo_ids: Sequence[int], fire_at: float) -> None:
+        if todo_ids:
+            get_sync_redis().zadd(self.key, {str(todo_id): fire_at for todo_id in todo_ids})
+
+
+@lru_cache()
+def get_reminder_scheduler() -> ReminderScheduler:
+    """Return the configured reminder scheduler."""
+
+    settings = get_settings()
+    lead = timedelta(hours=settings.reminder_lead_hours)
+    if settings.reminder_scheduler_backend.lower() == "redis":
+        return RedisReminderScheduler(lead=lead)
+    return ReminderScheduler(lead=lead)
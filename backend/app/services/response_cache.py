@@ -0,0 +1,276 @@
+"""Per-user cache of rendered todo list responses.
+
+Entries are keyed by ``(user, version, route, params)``. Every write bumps the
+user's version, so responses rendered before the write can never be served
+again; they simply age out of the LRU. Readers must read the version *before*
+querying the database and store under that version, which keeps a response
+rendered concurrently with a write from being cached as current.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class CachedResponse(NamedTuple):
+    """A rendered JSON body with the headers that belong to it."""
+
+    body: bytes
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """Cache that never stores anything; used when caching is disabled.
+
+    ``version`` returns ``None`` to signal that the caller should bypass the
+    cache entirely.
+    """
+
+    enabled = False
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    async def version(self, user_id: int) -> Optional[int]:
+        return None
+
+    async def get(self, user_id: int, version: int, key: CacheKey) -> Optional[CachedResponse]:
+        return None
+
+    async def set(
+        self, user_id: int, version: int, key: CacheKey, response: CachedResponse
+    ) -> None:
+        return None
+
+    async def invalidate(self, user_id: int) -> None:
+        """Bump the user's version after a write."""
+
+        return None
+
+    def _record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class InMemoryResponseCache(ResponseCache):
+    """Per-process LRU with per-user version counters and a TTL.
+
+    The TTL bounds staleness of time-dependent responses such as
+    ``/todos/due-soon``, which change as time passes without any write.
+
+    Versions live in this process only, so a write handled by another
+    worker is not seen here: use this backend with a single API worker.
+
+    Versions are drawn from one process-wide sequence and at most
+    ``max_entries`` users keep their own; when one is evicted, users without
+    an own version move to a fresh shared one, so nothing cached under an
+    evicted version can be served again.
+    """
+
+    enabled = True
+
+    def __init__(self, *, ttl: float, max_entries: int) -> None:
+        super().__init__()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sequence = itertools.count(1)
+        self._default_version = 0
+        self._versions: "OrderedDict[int, int]" = OrderedDict()
+        self._entries: "OrderedDict[Tuple[int, int, CacheKey], Tuple[float, CachedResponse]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    async def version(self, user_id: int) -> Optional[int]:
+        with self._lock:
+            return self._versions.get(user_id, self._default_version)
+
+    def _get_local(self, user_id: int, version: int, key: CacheKey) -> Optional[CachedResponse]:
+        entry_key = (user_id, version, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if expires_at <= time.monotonic():
+                del self._entries[entry_key]
+                return None
+            self._entries.move_to_end(entry_key)
+            return response
+
+    def _set_local(
+        self, user_id: int, version: int, key: CacheKey, response: CachedResponse
+    ) -> None:
+        entry_key = (user_id, version, key)
+        with self._lock:
+            self._entries[entry_key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def get(self, user_id: int, version: int, key: CacheKey) -> Optional[CachedResponse]:
+        response = self._get_local(user_id, version, key)
+        self._record(response is not None)
+        return response
+
+    async def set(
+        self, user_id: int, version: int, key: CacheKey, response: CachedResponse
+    ) -> None:
+        self._set_local(user_id, version, key, response)
+
+    async def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._versions[user_id] = next(self._sequence)
+            self._versions.move_to_end(user_id)
+            if len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+                self._default_version = next(self._sequence)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats.update(
+                entries=len(self._entries),
+                max_entries=self.max_entries,
+                versioned_users=len(self._versions),
+            )
+        return stats
+
+
+class RedisResponseCache(InMemoryResponseCache):
+    """Two-tier cache: the local LRU in front of entries shared through Redis.
+
+    Versions live in Redis so a write on any worker invalidates every
+    worker's entries. Redis failures bypass the cache rather than failing the
+    request. When bumping a version fails, this worker stops reading the
+    user's cache for one TTL, after which every entry rendered before the
+    write has expired; other workers cannot be told and may serve the old
+    list until then.
+    """
+
+    key_prefix = "todo-response:"
+
+    def __init__(self, *, ttl: int, max_entries: int) -> None:
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self.redis_hits = 0
+        self._bypass_until: Dict[int, float] = {}
+
+    def _bypassed(self, user_id: int) -> bool:
+        with self._lock:
+            until = self._bypass_until.get(user_id)
+            if until is None:
+                return False
+            if until > time.monotonic():
+                return True
+            del self._bypass_until[user_id]
+            return False
+
+    def _bypass(self, user_id: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if len(self._bypass_until) >= self.max_entries:
+                self._bypass_until = {
+                    user: until for user, until in self._bypass_until.items() if until > now
+                }
+            self._bypass_until[user_id] = now + self.ttl
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}ver:{user_id}"
+
+    def _entry_key(self, user_id: int, version: int, key: CacheKey) -> str:
+        digest = hashlib.blake2b(repr(key).encode("utf-8"), digest_size=12).hexdigest()
+        return f"{self.key_prefix}{user_id}:{version}:{digest}"
+
+    async def version(self, user_id: int) -> Optional[int]:
+        if self._bypassed(user_id):
+            return None
+        try:
+            return int(await get_redis().get(self._version_key(user_id)) or 0)
+        except RedisError:
+            logger.warning("Response cache version lookup failed", exc_info=True)
+            return None
+
+    async def get(self, user_id: int, version: int, key: CacheKey) -> Optional[CachedResponse]:
+        response = self._get_local(user_id, version, key)
+        if response is None:
+            try:
+                raw = await get_redis().get(self._entry_key(user_id, version, key))
+            except RedisError:
+                logger.warning("Response cache lookup failed", exc_info=True)
+                raw = None
+            if raw is not None:
+                headers, _, body = raw.partition(b"\n")
+                response = CachedResponse(body, json.loads(headers))
+                self._set_local(user_id, version, key, response)
+                self.redis_hits += 1
+        self._record(response is not None)
+        return response
+
+    async def set(
+        self, user_id: int, version: int, key: CacheKey, response: CachedResponse
+    ) -> None:
+        self._set_local(user_id, version, key, response)
+        payload = json.dumps(response.headers).encode("utf-8") + b"\n" + response.body
+        try:
+            await get_redis().set(self._entry_key(user_id, version, key), payload, ex=self.ttl)
+        except RedisError:
+            logger.warning("Response cache store failed", exc_info=True)
+
+    async def invalidate(self, user_id: int) -> None:
+        try:
+            await get_redis().incr(self._version_key(user_id))
+        except RedisError:
+            self._bypass(user_id)
+            logger.warning("Response cache invalidation failed for %s", user_id, exc_info=True)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["redis_hits"] = self.redis_hits
+        return stats
+
+
+@lru_cache()
+def get_response_cache() -> ResponseCache:
+    """Return the configured response cache backend."""
+
+    settings = get_settings()
+    backend = settings.response_cache_backend.lower()
+    if backend == "memory":
+        return InMemoryResponseCache(
+            ttl=settings.response_cache_ttl_seconds,
+            max_entries=settings.response_cache_max_entries,
+        )
+    if backend == "redis":
+        return RedisResponseCache(
+            ttl=settings.response_cache_ttl_seconds,
+            max_entries=settings.response_cache_max_entries,
+        )
+    return ResponseCache()
@@ -0,0 +1,301 @@
+"""Per-user pub/sub of todo changes backing the server-sent events stream."""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Deque, Iterable, List, Optional, Set, Tuple
+
+from redis.exceptions import RedisError
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis
+from backend.app.models.todo import TodoItem
+from backend.app.schemas.todo import TodoRead
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "created"
+EVENT_UPDATED = "updated"
+EVENT_DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class TodoEvent:
+    """A change to one todo, with ``data`` already encoded as JSON."""
+
+    id: int
+    user_id: int
+    type: str
+    data: str
+
+    def encode(self) -> str:
+        """Return the event as a server-sent events frame."""
+
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+
+def todo_payload(todo: TodoItem) -> str:
+    """Serialize ``todo`` as ``TodoRead`` JSON under Pydantic v1 or v2."""
+
+    if hasattr(TodoRead, "model_validate"):
+        return TodoRead.model_validate(todo, from_attributes=True).model_dump_json()
+    return TodoRead.from_orm(todo).json()
+
+
+def deleted_payload(todo_id: int) -> str:
+    return json.dumps({"id": todo_id})
+
+
+class TooManyStreamsError(Exception):
+    """Raised when a user already has the maximum number of open streams."""
+
+    def __init__(self, detail: str = "Too many open event streams.") -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+class TodoEventSubscription:
+    """Bounded queue of events for one open stream.
+
+    A subscriber that falls ``queue_size`` events behind is cut off instead of
+    buffering without limit; the client reconnects with ``Last-Event-ID`` and
+    catches up from the replay buffer.
+    """
+
+    def __init__(self, user_id: int, queue_size: int) -> None:
+        self.user_id = user_id
+        self._queue: "asyncio.Queue[Optional[TodoEvent]]" = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, event: TodoEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(None)
+
+    async def get(self, timeout: float) -> Optional[TodoEvent]:
+        """Return the next event; ``None`` once the subscriber was cut off.
+
+        Raises :class:`asyncio.TimeoutError` when nothing arrives in ``timeout``.
+        """
+
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+
+class _UserChannel:
+    """Replay buffer and live subscribers of a single user.
+
+    ``floor`` is the newest event id whose successors may be missing from the
+    buffer, either because they were evicted or because they happened before
+    the channel existed in this process.
+    """
+
+    def __init__(self, floor: int, replay_size: int) -> None:
+        self.floor = floor
+        self.replay_size = replay_size
+        self.buffer: Deque[TodoEvent] = deque()
+        self.subscribers: Set[TodoEventSubscription] = set()
+
+    def append(self, event: TodoEvent) -> None:
+        if len(self.buffer) >= self.replay_size:
+            self.floor = self.buffer.popleft().id
+        self.buffer.append(event)
+        for subscriber in tuple(self.subscribers):
+            subscriber.offer(event)
+
+    def replay_after(self, last_event_id: int) -> Optional[List[TodoEvent]]:
+        if last_event_id < self.floor:
+            return None
+        return [event for event in self.buffer if event.id > last_event_id]
+
+
+class TodoEventBus(ABC):
+    """Fan events out to the streams open in this process.
+
+    Channels are only kept for users that opened a stream here, so publishing
+    for other users costs a dictionary lookup. Idle channels are evicted LRU
+    once ``max_channels`` is exceeded. Subclasses implement :meth:`publish`,
+    which decides how events reach the other processes.
+    """
+
+    def __init__(
+        self,
+        *,
+        replay_size: int,
+        queue_size: int,
+        max_streams_per_user: int,
+        max_channels: int = 10_000,
+    ) -> None:
+        self.replay_size = replay_size
+        self.queue_size = queue_size
+        self.max_streams_per_user = max_streams_per_user
+        self.max_channels = max_channels
+        self._channels: "OrderedDict[int, _UserChannel]" = OrderedDict()
+        self._last_id = 0
+
+    @abstractmethod
+    async def publish(self, user_id: int, events: Iterable[Tuple[str, str]]) -> None:
+        """Publish ``(type, data)`` events for ``user_id``."""
+
+    def _dispatch(self, event: TodoEvent) -> None:
+        self._last_id = max(self._last_id, event.id)
+        channel = self._channels.get(event.user_id)
+        if channel is not None:
+            channel.append(event)
+
+    async def subscribe(
+        self, user_id: int, last_event_id: Optional[int]
+    ) -> Tuple[TodoEventSubscription, Optional[List[TodoEvent]]]:
+        """Open a subscription and return it with the events to replay first.
+
+        The backlog is ``None`` when the events following ``last_event_id`` are
+        no longer known; the client then has to refetch its state.
+        """
+
+        channel = self._channels.get(user_id)
+        if channel is None:
+            self._evict_idle_channels()
+            channel = self._channels[user_id] = _UserChannel(self._last_id, self.replay_size)
+        self._channels.move_to_end(user_id)
+        if len(channel.subscribers) >= self.max_streams_per_user:
+            raise TooManyStreamsError()
+        subscription = TodoEventSubscription(user_id, self.queue_size)
+        channel.subscribers.add(subscription)
+        backlog: Optional[List[TodoEvent]] = []
+        if last_event_id is not None:
+            backlog = channel.replay_after(last_event_id)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription: TodoEventSubscription) -> None:
+        channel = self._channels.get(subscription.user_id)
+        if channel is not None:
+            channel.subscribers.discard(subscription)
+
+    def _evict_idle_channels(self) -> None:
+        excess = len(self._channels) + 1 - self.max_channels
+        if excess <= 0:
+            return
+        idle = [user_id for user_id, channel in self._channels.items() if not channel.subscribers]
+        for user_id in idle[:excess]:
+            del self._channels[user_id]
+
+
+class InMemoryTodoEventBus(TodoEventBus):
+    """Single-process bus, suitable when the API runs one worker."""
+
+    def __init__(self, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        super().__init__(**kwargs)
+        # Seeded from the clock so ids keep increasing across restarts and a
+        # client resuming with an id from a previous process gets a reset.
+        self._last_id = time.time_ns() // 1000
+        self._ids = itertools.count(self._last_id + 1)
+
+    async def publish(self, user_id: int, events: Iterable[Tuple[str, str]]) -> None:
+        if user_id not in self._channels:
+            # Nobody can replay these; leave the payload generator unconsumed.
+            return
+        for event_type, data in events:
+            self._dispatch(TodoEvent(next(self._ids), user_id, event_type, data))
+
+
+# Allocates ids and publishes a whole batch in one round trip.
+_PUBLISH_SCRIPT = """
+local first = redis.call('INCRBY', KEYS[1], #ARGV - 1) - #ARGV + 2
+local user_id = ARGV[1]
+for i = 2, #ARGV do
+    redis.call('PUBLISH', KEYS[2], cjson.encode({first + i - 2, tonumber(user_id), ARGV[i]}))
+end
+return first
+"""
+
+
+class RedisTodoEventBus(TodoEventBus):
+    """Bus shared by several workers through Redis pub/sub.
+
+    Event ids come from a Redis counter, so they are ordered across workers.
+    Each worker runs one listener task that feeds its local channels; replay
+    buffers are therefore per worker, and a client resuming on a worker that
+    has not seen its history receives a reset.
+    """
+
+    sequence_key = "todo-events:seq"
+    channel_name = "todo-events"
+
+    def __init__(self, **kwargs) -> None:  # type: ignore[no-untyped-def]
+        super().__init__(**kwargs)
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    async def publish(self, user_id: int, events: Iterable[Tuple[str, str]]) -> None:
+        args = [str(user_id)]
+        args.extend(json.dumps([event_type, data]) for event_type, data in events)
+        if len(args) == 1:
+            return
+        try:
+            await get_redis().eval(
+                _PUBLISH_SCRIPT, 2, self.sequence_key, self.channel_name, *args
+            )
+        except RedisError:
+            logger.warning("Publishing todo events failed for user %s", user_id, exc_info=True)
+
+    async def subscribe(
+        self, user_id: int, last_event_id: Optional[int]
+    ) -> Tuple[TodoEventSubscription, Optional[List[TodoEvent]]]:
+        if self._listener is None or self._listener.done():
+            await self._sync_last_id()
+            self._listener = asyncio.create_task(self._listen())
+        return await super().subscribe(user_id, last_event_id)
+
+    async def _sync_last_id(self) -> None:
+        """Move every floor up to the current counter after (re)connecting."""
+
+        try:
+            current = int(await get_redis().get(self.sequence_key) or 0)
+        except RedisError:
+            logger.warning("Reading the todo event sequence failed", exc_info=True)
+            return
+        self._last_id = max(self._last_id, current)
+        for channel in self._channels.values():
+            channel.floor = max(channel.floor, current)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel_name)
+                async for message in pubsub.listen():
+                    event_id, user_id, raw = json.loads(message["data"])
+                    event_type, data = json.loads(raw)
+                    self._dispatch(TodoEvent(event_id, user_id, event_type, data))
+            except RedisError:
+                logger.warning("Todo event listener disconnected, retrying", exc_info=True)
+            finally:
+                await pubsub.close()
+            await asyncio.sleep(1)
+            # Events published while disconnected were missed.
+            await self._sync_last_id()
+
+
+@lru_cache()
+def get_todo_event_bus() -> TodoEventBus:
+    """Return the configured todo event bus."""
+
+    settings = get_settings()
+    options = dict(
+        replay_size=settings.todo_events_replay_size,
+        queue_size=settings.todo_events_queue_size,
+        max_streams_per_user=settings.todo_events_max_streams_per_user,
+    )
+    if settings.todo_events_backend.lower() == "redis":
+        return RedisTodoEventBus(**options)
+    return InMemoryTodoEventBus(**options)
@@ -1,13 +1,46 @@
 """Business logic for todo operations."""
 
+import re
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from typing import List, Optional, Union
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    and_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    table,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Insert, Select, Update
 
+from backend.app.core.config import get_settings
+from backend.app.core.etag import make_etag
+from backend.app.core.pagination import SyncToken, decode_cursor, decode_search_cursor
+from backend.app.models.stats import TodoStatusCount
 from backend.app.models.todo import TodoItem, TodoStatus
-from backend.app.schemas.todo import TodoCreate, TodoUpdate
+from backend.app.models.tombstone import TodoTombstone
+from backend.app.schemas.todo import TodoBatchUpdateItem, TodoCreate, TodoUpdate
+from backend.app.services.reminder_scheduler import get_reminder_scheduler
+from backend.app.services.response_cache import get_response_cache
+from backend.app.services.todo_events import (
+    EVENT_CREATED,
+    EVENT_DELETED,
+    EVENT_UPDATED,
+    deleted_payload,
+    get_todo_event_bus,
+    todo_payload,
+)
 
 TodoSchema = Union[TodoCreate, TodoUpdate]
 
@@ -26,82 +59,572 @@ class TodoNotFoundError(Exception):
     pass
 
 
-class TodoService:
-    """Service layer responsible for managing todo items."""
+class SyncTokenExpiredError(Exception):
+    """Raised when a sync token predates the tombstone retention period."""
 
-    def __init__(self, db: Session) -> None:
+    pass
+
+
+class TodoChangeSet(NamedTuple):
+    """One page of a delta sync: changed todos, deleted ids and the next token."""
+
+    changed: List[TodoItem]
+    deleted: List[int]
+    token: SyncToken
+    has_more: bool
+
+
+# Position of a client that has not synced anything yet.
+_SYNC_EPOCH = datetime(1970, 1, 1)
+
+# Columns exposed by ``TodoRead``, in its field order.
+TODO_READ_FIELDS: Tuple[str, ...] = (
+    "title",
+    "description",
+    "status",
+    "due_date",
+    "id",
+    "user_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def _read_columns(fields: Optional[Sequence[str]]) -> list:
+    """Return the columns to select for ``fields`` (all ``TodoRead`` fields by default).
+
+    ``id`` and ``created_at`` are always selected because the next-page cursor
+    is built from them.
+    """
+
+    names = dict.fromkeys([*(fields or TODO_READ_FIELDS), "id", "created_at"])
+    return [getattr(TodoItem, name) for name in names]
+
+
+def _list_todos_stmt(
+    *,
+    user_id: int,
+    status: Optional[TodoStatus],
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    fields: Optional[Sequence[str]] = None,
+) -> Select:
+    """Build the paginated listing query of the todo service.
+
+    When ``cursor`` is provided the page starts right after the position it
+    encodes (keyset pagination) and ``skip`` is ignored, so deep pages cost the
+    same as the first one. Only the columns for ``fields`` are selected, so
+    rows come back as plain ``Row`` tuples that bypass the identity map.
+    """
+
+    query = select(*_read_columns(fields)).where(TodoItem.user_id == user_id)
+    if status is not None:
+        query = query.where(TodoItem.status == status)
+    if cursor is not None:
+        created_at, todo_id = decode_cursor(cursor)
+        query = query.where(
+            or_(
+                TodoItem.created_at < created_at,
+                and_(TodoItem.created_at == created_at, TodoItem.id < todo_id),
+            )
+        )
+        skip = 0
+    return (
+        query.order_by(TodoItem.created_at.desc(), TodoItem.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+# Full-text index objects created by the search migration; they are not part
+# of the ORM models because their DDL differs per database.
+_todo_items_fts = table("todo_items_fts", column("rowid"))
+_SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def _search_matches(dialect: str, user_id: int, query: str) -> Optional[Select]:
+    """Select ``(id, rank)`` of the user's todos matching ``query``; higher rank is better.
+
+    Returns ``None`` when ``query`` contains no searchable terms.
+    """
+
+    if dialect == "postgresql":
+        vector = literal_column("todo_items.search_vector", postgresql.TSVECTOR())
+        ts_query = func.websearch_to_tsquery(cast("simple", postgresql.REGCONFIG), query)
+        return select(
+            TodoItem.id.label("id"), func.ts_rank_cd(vector, ts_query).label("rank")
+        ).where(TodoItem.user_id == user_id, vector.op("@@")(ts_query))
+
+    # SQLite FTS5: quote every term so user input cannot inject query syntax.
+    terms = _SEARCH_TERM.findall(query)
+    if not terms:
+        return None
+    fts = literal_column("todo_items_fts")
+    return (
+        select(_todo_items_fts.c.rowid.label("id"), (-func.bm25(fts)).label("rank"))
+        .join(TodoItem, TodoItem.id == _todo_items_fts.c.rowid)
+        .where(fts.op("MATCH")(" ".join(f'"{term}"' for term in terms)))
+        .where(TodoItem.user_id == user_id)
+    )
+
+
+def _search_stmt(
+    *, dialect: str, user_id: int, query: str, limit: int, cursor: Optional[str]
+) -> Optional[Select]:
+    """Build a ranked, keyset-paginated search over the user's todos.
+
+    Rows carry the ``TodoRead`` columns plus ``rank``; pages continue after
+    the ``(rank, id)`` position encoded in ``cursor``.
+    """
+
+    matches = _search_matches(dialect, user_id, query)
+    if matches is None:
+        return None
+    ranked = matches.subquery("matches")
+    stmt = select(*_read_columns(None), ranked.c.rank).join(ranked, ranked.c.id == TodoItem.id)
+    if cursor is not None:
+        rank, todo_id = decode_search_cursor(cursor)
+        stmt = stmt.where(
+            or_(ranked.c.rank < rank, and_(ranked.c.rank == rank, TodoItem.id < todo_id))
+        )
+    return stmt.order_by(ranked.c.rank.desc(), TodoItem.id.desc()).limit(limit)
+
+
+def _page_fingerprint_stmt(page: Select) -> Select:
+    """Aggregate a listing page into ``(count, max(updated_at), sum(id))``.
+
+    The sum of ids changes when rows shift into or out of the page, which the
+    count and newest ``updated_at`` alone would miss.
+    """
+
+    rows = page.with_only_columns(TodoItem.id, TodoItem.updated_at).subquery()
+    return select(func.count(), func.max(rows.c.updated_at), func.sum(rows.c.id))
+
+
+def todo_etag(todo: TodoItem) -> str:
+    """Return the ETag of a single todo item."""
+
+    return make_etag(todo.id, todo.updated_at.isoformat())
+
+
+def _changed_todos_stmt(*, user_id: int, since: Optional[SyncToken], limit: int) -> Select:
+    """Select todos changed after ``since`` in ``(updated_at, id)`` order.
+
+    One extra row is fetched to tell whether another page follows.
+    """
+
+    query = select(TodoItem).where(TodoItem.user_id == user_id)
+    if since is not None:
+        query = query.where(
+            or_(
+                TodoItem.updated_at > since.updated_at,
+                and_(TodoItem.updated_at == since.updated_at, TodoItem.id > since.todo_id),
+            )
+        )
+    return query.order_by(TodoItem.updated_at, TodoItem.id).limit(limit + 1)
+
+
+def _tombstones_stmt(*, user_id: int, after_id: int, limit: int) -> Select:
+    return (
+        select(TodoTombstone.id, TodoTombstone.todo_id)
+        .where(TodoTombstone.user_id == user_id, TodoTombstone.id > after_id)
+        .order_by(TodoTombstone.id)
+        .limit(limit + 1)
+    )
+
+
+def _check_sync_token(since: Optional[SyncToken], now: datetime) -> None:
+    retention = timedelta(days=get_settings().todo_tombstone_retention_days)
+    if since is not None and since.issued_at < now - retention:
+        raise SyncTokenExpiredError("Sync token expired; a full sync is required.")
+
+
+def _status_counts_stmt(
+    dialect: str, user_id: int, deltas: "Counter[TodoStatus]"
+) -> Optional[Insert]:
+    """Build one upsert adding ``deltas`` to the user's status counters.
+
+    Rows follow the declaration order of :class:`TodoStatus`, the order in
+    which ``reconcile_todo_stats`` locks them, so the two cannot deadlock.
+    """
+
+    rows = [
+        {"user_id": user_id, "status": status, "count": deltas[status]}
+        for status in TodoStatus
+        if deltas.get(status)
+    ]
+    if not rows:
+        return None
+    insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert_(TodoStatusCount).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[TodoStatusCount.user_id, TodoStatusCount.status],
+        set_={"count": TodoStatusCount.count + stmt.excluded.count},
+    )
+
+
+def _status_change(old: TodoStatus, new: Optional[TodoStatus]) -> "Counter[TodoStatus]":
+    deltas: "Counter[TodoStatus]" = Counter()
+    if new is not None and new != old:
+        deltas[old] -= 1
+        deltas[new] += 1
+    return deltas
+
+
+def _overdue_count_stmt(user_id: int) -> Select:
+    """Count the user's open todos past their due date.
+
+    Served by the ``(user_id, due_date)`` index; unlike the status counts it
+    cannot be maintained incrementally because todos become overdue as time
+    passes.
+    """
+
+    return select(func.count()).where(
+        TodoItem.user_id == user_id,
+        TodoItem.due_date < datetime.utcnow(),
+        TodoItem.status != TodoStatus.COMPLETED,
+    )
+
+
+def _stats_from_counts(rows: Sequence[Row], overdue: int) -> dict:
+    by_status = {status: 0 for status in TodoStatus}
+    for status, count in rows:
+        by_status[status] = count
+    return {"total": sum(by_status.values()), "by_status": by_status, "overdue": overdue}
+
+
+def _due_soon_stmt(*, user_id: int, hours: int) -> Select:
+    now = datetime.utcnow()
+    upcoming = now + timedelta(hours=hours)
+    return (
+        select(*_read_columns(None))
+        .where(TodoItem.user_id == user_id)
+        .where(TodoItem.due_date != None)  # noqa: E711 - intentional SQLAlchemy comparison
+        .where(TodoItem.status != TodoStatus.COMPLETED)
+        .where(TodoItem.due_date >= now)
+        .where(TodoItem.due_date <= upcoming)
+        .order_by(TodoItem.due_date.asc())
+    )
+
+
+def _apply_update(todo: TodoItem, todo_in: TodoUpdate) -> None:
+    data = _model_to_dict(todo_in, exclude_unset=True)
+    for field, value in data.items():
+        setattr(todo, field, value)
+    todo.updated_at = datetime.utcnow()
+
+
+def _batch_update_groups(
+    items: Sequence[TodoBatchUpdateItem], now: datetime
+) -> Dict[Tuple[str, ...], List[dict]]:
+    """Group update parameters by the set of fields they change.
+
+    Each group can then be sent as a single executemany ``UPDATE``.
+    """
+
+    groups: Dict[Tuple[str, ...], List[dict]] = defaultdict(list)
+    for item in items:
+        data = _model_to_dict(item, exclude_unset=True)
+        todo_id = data.pop("id")
+        data["updated_at"] = now
+        fields = tuple(sorted(data))
+        groups[fields].append({"b_id": todo_id, **{f"b_{key}": value for key, value in data.items()}})
+    return groups
+
+
+def _batch_update_stmt(user_id: int, fields: Tuple[str, ...]) -> Update:
+    table = TodoItem.__table__
+    return (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .where(table.c.user_id == user_id)
+        .values({field: bindparam(f"b_{field}") for field in fields})
+    )
+
+
+def _ensure_owned(todo: Optional[TodoItem], user_id: int) -> TodoItem:
+    if todo is None or todo.user_id != user_id:
+        raise TodoNotFoundError("Todo item not found.")
+    return todo
+
+
+class AsyncTodoService:
+    """Service layer responsible for managing todo items, used by the API routes.
+
+    After committing, mutations invalidate the user's cached list responses,
+    publish change events to the todo event bus and schedule or revoke the
+    todos' reminders.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    def list_todos(
+    async def list_todos(
         self,
         *,
         user_id: int,
         status: Optional[TodoStatus] = None,
         skip: int = 0,
         limit: int = 20,
-    ) -> List[TodoItem]:
-        """Return todo items owned by the given user with optional filters."""
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Sequence[Row]:
+        """Return rows of the user's todos, projected to ``fields``, with optional filters."""
 
-        query = select(TodoItem).where(TodoItem.user_id == user_id)
-        if status is not None:
-            query = query.where(TodoItem.status == status)
-        query = query.order_by(TodoItem.created_at.desc()).offset(skip).limit(limit)
-        return self.db.execute(query).scalars().all()
+        stmt = _list_todos_stmt(
+            user_id=user_id, status=status, skip=skip, limit=limit, cursor=cursor, fields=fields
+        )
+        return (await self.db.execute(stmt)).all()
+
+    async def list_todos_etag(
+        self,
+        *,
+        user_id: int,
+        status: Optional[TodoStatus] = None,
+        skip: int = 0,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Return the ETag of a listing page using a single aggregate query.
+
+        No ORM objects are built, so unchanged pages can be answered with
+        ``304 Not Modified`` before the page itself is loaded.
+        """
 
-    def get_todo(self, *, todo_id: int, user_id: int) -> TodoItem:
+        page = _list_todos_stmt(
+            user_id=user_id, status=status, skip=skip, limit=limit, cursor=cursor
+        )
+        count, newest, id_sum = (await self.db.execute(_page_fingerprint_stmt(page))).one()
+        return make_etag(
+            user_id,
+            status.value if status else "",
+            skip,
+            limit,
+            cursor or "",
+            ",".join(fields or ()),
+            count,
+            newest.isoformat() if newest else "",
+            id_sum or 0,
+        )
+
+    async def get_todo(self, *, todo_id: int, user_id: int) -> TodoItem:
         """Retrieve a single todo item owned by the user."""
 
-        return self._get_owned_todo(todo_id=todo_id, user_id=user_id)
+        return await self._get_owned_todo(todo_id=todo_id, user_id=user_id)
+
+    async def search_todos(
+        self, *, user_id: int, query: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> Sequence[Row]:
+        """Return the user's todos matching ``query`` in title or description, best first."""
+
+        stmt = _search_stmt(
+            dialect=self.db.get_bind().dialect.name,
+            user_id=user_id,
+            query=query,
+            limit=limit,
+            cursor=cursor,
+        )
+        if stmt is None:
+            return []
+        return (await self.db.execute(stmt)).all()
 
-    def create_todo(self, *, user_id: int, todo_in: TodoCreate) -> TodoItem:
+    async def create_todo(self, *, user_id: int, todo_in: TodoCreate) -> TodoItem:
         """Create a new todo item for the given user."""
 
         todo = TodoItem(**_model_to_dict(todo_in), user_id=user_id)
         self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+        await self._adjust_counts(user_id, Counter([todo.status]))
+        await self.db.commit()
+        await self.db.refresh(todo)
+        await self._after_save(user_id, EVENT_CREATED, [todo])
         return todo
 
-    def update_todo(
+    async def update_todo(
         self, *, todo_id: int, user_id: int, todo_in: TodoUpdate
     ) -> TodoItem:
         """Update an existing todo item while validating ownership."""
 
-        todo = self._get_owned_todo(todo_id=todo_id, user_id=user_id)
-        data = _model_to_dict(todo_in, exclude_unset=True)
-        for field, value in data.items():
-            setattr(todo, field, value)
-        todo.updated_at = datetime.utcnow()
+        todo = await self._get_owned_todo(todo_id=todo_id, user_id=user_id)
+        previous_status = todo.status
+        _apply_update(todo, todo_in)
         self.db.add(todo)
-        self.db.commit()
-        self.db.refresh(todo)
+        await self._adjust_counts(user_id, _status_change(previous_status, todo.status))
+        await self.db.commit()
+        await self.db.refresh(todo)
+        await self._after_save(user_id, EVENT_UPDATED, [todo])
         return todo
 
-    def delete_todo(self, *, todo_id: int, user_id: int) -> None:
+    async def delete_todo(self, *, todo_id: int, user_id: int) -> None:
         """Delete a todo item owned by the user."""
 
-        todo = self._get_owned_todo(todo_id=todo_id, user_id=user_id)
-        self.db.delete(todo)
-        self.db.commit()
+        todo = await self._get_owned_todo(todo_id=todo_id, user_id=user_id)
+        await self.db.delete(todo)
+        self.db.add(TodoTombstone(todo_id=todo_id, user_id=user_id))
+        await self._adjust_counts(user_id, Counter({todo.status: -1}))
+        await self.db.commit()
+        await self._after_delete(user_id, [todo_id])
+
+    async def list_due_soon(self, *, user_id: int, hours: int = 24) -> Sequence[Row]:
+        """Return rows of todos due within the next ``hours`` for the given user."""
+
+        stmt = _due_soon_stmt(user_id=user_id, hours=hours)
+        return (await self.db.execute(stmt)).all()
+
+    async def list_changes(
+        self, *, user_id: int, since: Optional[SyncToken], limit: int = 100
+    ) -> TodoChangeSet:
+        """Return todos changed and ids deleted since ``since`` (``None`` = everything).
 
-    def list_due_soon(self, *, user_id: int, hours: int = 24) -> List[TodoItem]:
-        """Return todos due within the next ``hours`` for the given user."""
+        Both lists are keyset-paginated by ``limit``; ``has_more`` tells the
+        client to call again with the returned token.
+        """
 
         now = datetime.utcnow()
-        upcoming = now + timedelta(hours=hours)
-        stmt = (
-            select(TodoItem)
-            .where(TodoItem.user_id == user_id)
-            .where(TodoItem.due_date != None)  # noqa: E711 - intentional SQLAlchemy comparison
-            .where(TodoItem.status != TodoStatus.COMPLETED)
-            .where(TodoItem.due_date >= now)
-            .where(TodoItem.due_date <= upcoming)
-            .order_by(TodoItem.due_date.asc())
+        _check_sync_token(since, now)
+        changed = list(
+            (await self.db.scalars(_changed_todos_stmt(user_id=user_id, since=since, limit=limit))).all()
         )
-        return self.db.execute(stmt).scalars().all()
+        if since is None:
+            # A fresh client only needs deletions that happen from now on.
+            last_tombstone = await self.db.scalar(
+                select(func.max(TodoTombstone.id)).where(TodoTombstone.user_id == user_id)
+            )
+            tombstones = []
+            tombstone_id = last_tombstone or 0
+        else:
+            stmt = _tombstones_stmt(user_id=user_id, after_id=since.tombstone_id, limit=limit)
+            tombstones = (await self.db.execute(stmt)).all()
+            tombstone_id = since.tombstone_id
+        has_more = len(changed) > limit or len(tombstones) > limit
+        changed, tombstones = changed[:limit], tombstones[:limit]
 
-    def _get_owned_todo(self, *, todo_id: int, user_id: int) -> TodoItem:
-        todo = self.db.get(TodoItem, todo_id)
-        if todo is None or todo.user_id != user_id:
-            raise TodoNotFoundError("Todo item not found.")
-        return todo
+        if changed:
+            position = (changed[-1].updated_at, changed[-1].id)
+        elif since is not None:
+            position = (since.updated_at, since.todo_id)
+        else:
+            position = (_SYNC_EPOCH, 0)
+        if tombstones:
+            tombstone_id = tombstones[-1].id
+        return TodoChangeSet(
+            changed=changed,
+            deleted=[row.todo_id for row in tombstones],
+            token=SyncToken(now, position[0], position[1], tombstone_id),
+            has_more=has_more,
+        )
+
+    async def get_stats(self, *, user_id: int) -> dict:
+        """Return the user's todo counts by status plus the number overdue."""
+
+        counts_stmt = select(TodoStatusCount.status, TodoStatusCount.count).where(
+            TodoStatusCount.user_id == user_id
+        )
+        rows = (await self.db.execute(counts_stmt)).all()
+        return _stats_from_counts(rows, await self.db.scalar(_overdue_count_stmt(user_id)))
+
+    async def _adjust_counts(self, user_id: int, deltas: "Counter[TodoStatus]") -> None:
+        stmt = _status_counts_stmt(self.db.get_bind().dialect.name, user_id, deltas)
+        if stmt is not None:
+            await self.db.execute(stmt)
+
+    async def _get_owned_todo(self, *, todo_id: int, user_id: int) -> TodoItem:
+        return _ensure_owned(await self.db.get(TodoItem, todo_id), user_id)
+
+    async def _after_save(
+        self, user_id: int, event_type: str, todos: Sequence[TodoItem]
+    ) -> None:
+        await get_response_cache().invalidate(user_id)
+        await get_todo_event_bus().publish(
+            user_id, ((event_type, todo_payload(todo)) for todo in todos)
+        )
+        await get_reminder_scheduler().schedule(todos)
+
+    async def _after_delete(self, user_id: int, ids: Sequence[int]) -> None:
+        await get_response_cache().invalidate(user_id)
+        await get_todo_event_bus().publish(
+            user_id, ((EVENT_DELETED, deleted_payload(todo_id)) for todo_id in ids)
+        )
+        await get_reminder_scheduler().cancel(ids)
+
+    async def create_todos(
+        self, *, user_id: int, items: Sequence[TodoCreate]
+    ) -> List[TodoItem]:
+        """Insert ``items`` with one multi-row ``INSERT ... RETURNING``."""
+
+        if not items:
+            return []
+        rows = [{**_model_to_dict(item), "user_id": user_id} for item in items]
+        stmt = insert(TodoItem).returning(TodoItem, sort_by_parameter_order=True)
+        todos = list((await self.db.scalars(stmt, rows)).all())
+        await self._adjust_counts(user_id, Counter(todo.status for todo in todos))
+        await self.db.commit()
+        await self._after_save(user_id, EVENT_CREATED, todos)
+        return todos
+
+    async def update_todos(
+        self, *, user_id: int, items: Sequence[TodoBatchUpdateItem]
+    ) -> Tuple[Dict[int, TodoItem], Set[int]]:
+        """Apply partial updates in one transaction.
+
+        Ownership is enforced in the ``WHERE`` clause of every statement.
+        Returns the updated todos by id and the ids that were not found (or
+        not owned by the user). Later duplicates of an id are ignored.
+        """
+
+        ids = list(dict.fromkeys(item.id for item in items))
+        owned_stmt = select(TodoItem.id, TodoItem.status).where(
+            TodoItem.id.in_(ids), TodoItem.user_id == user_id
+        )
+        owned = dict((await self.db.execute(owned_stmt)).all())
+        seen: Set[int] = set()
+        updates = []
+        deltas: "Counter[TodoStatus]" = Counter()
+        for item in items:
+            if item.id in owned and item.id not in seen:
+                seen.add(item.id)
+                updates.append(item)
+                deltas.update(_status_change(owned[item.id], item.status))
+
+        groups = _batch_update_groups(updates, datetime.utcnow())
+        for fields, params in groups.items():
+            await self.db.execute(_batch_update_stmt(user_id, fields), params)
+        await self._adjust_counts(user_id, deltas)
+        await self.db.commit()
+
+        updated: Dict[int, TodoItem] = {}
+        if owned:
+            stmt = (
+                select(TodoItem)
+                .where(TodoItem.id.in_(owned))
+                .execution_options(populate_existing=True)
+            )
+            updated = {todo.id: todo for todo in (await self.db.scalars(stmt)).all()}
+            await self._after_save(user_id, EVENT_UPDATED, list(updated.values()))
+        return updated, set(ids) - owned.keys()
+
+    async def delete_todos(self, *, user_id: int, ids: Sequence[int]) -> Set[int]:
+        """Delete the user's todos among ``ids`` and return the ids removed."""
+
+        if not ids:
+            return set()
+        stmt = (
+            delete(TodoItem)
+            .where(TodoItem.id.in_(set(ids)), TodoItem.user_id == user_id)
+            .returning(TodoItem.id, TodoItem.status)
+            .execution_options(synchronize_session=False)
+        )
+        removed = (await self.db.execute(stmt)).all()
+        deleted = {todo_id for todo_id, _ in removed}
+        deltas: "Counter[TodoStatus]" = Counter()
+        deltas.subtract(status for _, status in removed)
+        await self._adjust_counts(user_id, deltas)
+        if deleted:
+            await self.db.execute(
+                insert(TodoTombstone),
+                [{"todo_id": todo_id, "user_id": user_id} for todo_id in sorted(deleted)],
+            )
+        await self.db.commit()
+        await self._after_delete(user_id, sorted(deleted))
+        return deleted
@@ -0,0 +1,195 @@
+"""Cache of authenticated user snapshots used to skip per-request user lookups."""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Set
+
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import get_settings
+from backend.app.core.redis import get_redis, get_sync_redis
+from backend.app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Compact view of a user that is sufficient to authorize a request."""
+
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(id=user.id, email=user.email, is_active=user.is_active)
+
+
+class UserCache:
+    """Interface shared by the user cache backends.
+
+    ``get`` and ``set`` run on the request path and are coroutines;
+    ``invalidate`` is synchronous so it can be called from ORM session hooks,
+    and must not block when those run on the event loop.
+    """
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        return None
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        return None
+
+    def invalidate(self, user_id: int) -> None:
+        self.invalidate_many((user_id,))
+
+    def invalidate_many(self, user_ids: Iterable[int]) -> None:
+        return None
+
+
+class NullUserCache(UserCache):
+    """Backend used when caching is disabled; every lookup is a miss."""
+
+
+class InMemoryUserCache(UserCache):
+    """Per-process LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, *, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple[float, UserSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        with self._lock:
+            self._entries[snapshot.id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_many(self, user_ids: Iterable[int]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+class RedisUserCache(UserCache):
+    """Cache shared by all workers; Redis handles TTL expiry and LRU eviction.
+
+    Redis failures degrade to cache misses so authentication falls back to the
+    database instead of failing the request. Invalidations issued on the event
+    loop (commits of an ``AsyncSession``) are sent by the asyncio client in a
+    background task; elsewhere (Celery, sync sessions in the thread pool) the
+    blocking client deletes the keys in one call.
+    """
+
+    key_prefix = "user-cache:"
+
+    def __init__(self, *, ttl: int) -> None:
+        self.ttl = ttl
+        self._pending: Set["asyncio.Task[None]"] = set()
+
+    def _key(self, user_id: int) -> str:
+        return f"{self.key_prefix}{user_id}"
+
+    async def get(self, user_id: int) -> Optional[UserSnapshot]:
+        try:
+            raw = await get_redis().get(self._key(user_id))
+        except RedisError:
+            logger.warning("User cache lookup failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        cached_id, email, is_active = json.loads(raw)
+        return UserSnapshot(id=cached_id, email=email, is_active=is_active)
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        payload = json.dumps([snapshot.id, snapshot.email, snapshot.is_active])
+        try:
+            await get_redis().set(self._key(snapshot.id), payload, ex=self.ttl)
+        except RedisError:
+            logger.warning("User cache store failed", exc_info=True)
+
+    def invalidate_many(self, user_ids: Iterable[int]) -> None:
+        keys = [self._key(user_id) for user_id in user_ids]
+        if not keys:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                get_sync_redis().delete(*keys)
+            except RedisError:
+                logger.warning("User cache invalidation failed for %s", keys, exc_info=True)
+            return
+        task = loop.create_task(self._delete(keys))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _delete(self, keys: list) -> None:
+        try:
+            await get_redis().delete(*keys)
+        except RedisError:
+            logger.warning("User cache invalidation failed for %s", keys, exc_info=True)
+
+
+@lru_cache()
+def get_user_cache() -> UserCache:
+    """Return the configured user cache backend."""
+
+    settings = get_settings()
+    backend = settings.user_cache_backend.lower()
+    if backend == "memory":
+        return InMemoryUserCache(
+            ttl=settings.user_cache_ttl_seconds,
+            max_entries=settings.user_cache_max_entries,
+        )
+    if backend == "redis":
+        return RedisUserCache(ttl=settings.user_cache_ttl_seconds)
+    return NullUserCache()
+
+
+_PENDING_KEY = "user_cache_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, _flush_context) -> None:  # type: ignore[no-untyped-def]
+    changed = {
+        obj.id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    changed: Set[int] = session.info.pop(_PENDING_KEY, set())
+    if changed:
+        get_user_cache().invalidate_many(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
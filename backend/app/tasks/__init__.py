@@ -1,5 +1,8 @@
 """Task modules for background processing."""
 
 __all__ = [
+    "refresh_tokens",
     "reminders",
+    "stats",
+    "tombstones",
 ]
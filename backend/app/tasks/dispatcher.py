@@ -0,0 +1,60 @@
+"""Dispatcher process moving due reminders from the timer wheel to Celery.
+
+Run one or more instances next to the Celery worker::
+
+    python -m backend.app.tasks.dispatcher
+
+Popping is atomic, so extra instances only add redundancy.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from backend.app.celery_app import REMINDER_BATCH_SIZE
+from backend.app.core.config import get_settings
+from backend.app.services.reminder_scheduler import ReminderScheduler, get_reminder_scheduler
+from backend.app.tasks.reminders import schedule_pending_reminders, send_todo_reminders
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch_due_reminders(scheduler: ReminderScheduler, limit: int = REMINDER_BATCH_SIZE) -> int:
+    """Hand up to ``limit`` due reminders to Celery and return how many were sent."""
+
+    now = time.time()
+    todo_ids = scheduler.pop_due(now, limit)
+    if not todo_ids:
+        return 0
+    try:
+        send_todo_reminders.delay(todo_ids)
+    except Exception:
+        scheduler.requeue(todo_ids, now)
+        raise
+    return len(todo_ids)
+
+
+def run() -> None:
+    """Dispatch due reminders until interrupted."""
+
+    scheduler = get_reminder_scheduler()
+    if not scheduler.enabled:
+        raise SystemExit("REMINDER_SCHEDULER_BACKEND is not 'redis'; nothing to dispatch.")
+    interval = get_settings().reminder_dispatch_interval_seconds
+    schedule_pending_reminders()
+    while True:
+        try:
+            dispatched = dispatch_due_reminders(scheduler)
+        except Exception:
+            logger.exception("Dispatching reminders failed, retrying")
+            dispatched = 0
+        if dispatched:
+            logger.info("Dispatched %d reminders", dispatched)
+        if dispatched < REMINDER_BATCH_SIZE:
+            time.sleep(interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run()
@@ -0,0 +1,32 @@
+"""Celery tasks maintaining the SQL refresh token store."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+
+from celery import shared_task
+from sqlalchemy import delete
+
+from backend.app.db.session import session_scope
+from backend.app.models.refresh_token import RefreshTokenFamily
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="backend.app.tasks.refresh_tokens.prune_refresh_token_families")
+def prune_refresh_token_families() -> int:
+    """Delete refresh token families whose last token has expired.
+
+    Expired rows are already ignored by the store; pruning keeps the table
+    proportional to the live sessions. Returns the number of rows removed.
+    """
+
+    now = datetime.utcnow()
+    with session_scope() as session:
+        result = session.execute(
+            delete(RefreshTokenFamily).where(RefreshTokenFamily.expires_at <= now)
+        )
+        removed = result.rowcount or 0
+    logger.info("Pruned %d expired refresh token families", removed)
+    return removed
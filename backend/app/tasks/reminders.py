@@ -4,46 +4,246 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timedelta
+from typing import Iterator, List, Sequence, Tuple
 
-from celery import shared_task
-from sqlalchemy import select
+from celery import chord, shared_task
+from sqlalchemy import exists, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from backend.app.celery_app import REMINDER_BATCH_SIZE
+from backend.app.core.config import get_settings
+from backend.app.db.query_counter import query_budget
 from backend.app.db.session import session_scope
+from backend.app.models.notification import TodoNotification
 from backend.app.models.todo import TodoItem, TodoStatus
+from backend.app.services.reminder_scheduler import get_reminder_scheduler
 
 logger = logging.getLogger(__name__)
 
+# (user_id, todo_id) keyset position of a due todo.
+TodoKey = Tuple[int, int]
 
-@shared_task(name="backend.app.tasks.reminders.send_due_notifications")
-def send_due_notifications() -> int:
-    """Send notifications for todos due within the next 24 hours.
 
-    Returns the number of notifications that were triggered to aid visibility
-    in logs and monitoring. In a real system this function would integrate with
-    an email/SMS service – here we log a message for each todo as a placeholder.
+def _due_filter(stmt: Select, window_start: datetime, window_end: datetime) -> Select:
+    """Restrict ``stmt`` to due todos that have not been notified yet.
+
+    The ledger anti-join is served by the ``(todo_id, due_date)`` unique index.
     """
 
-    now = datetime.utcnow()
-    upcoming = now + timedelta(hours=24)
+    already_sent = exists().where(
+        TodoNotification.todo_id == TodoItem.id,
+        TodoNotification.due_date == TodoItem.due_date,
+    )
+    return (
+        stmt.where(TodoItem.due_date != None)  # noqa: E711 - intentional SQLAlchemy comparison
+        .where(TodoItem.status != TodoStatus.COMPLETED)
+        .where(TodoItem.due_date <= window_end)
+        .where(TodoItem.due_date >= window_start)
+        .where(~already_sent)
+    )
 
-    with session_scope() as session:
-        stmt = (
-            select(TodoItem)
-            .where(TodoItem.due_date != None)  # noqa: E711 - intentional SQLAlchemy comparison
-            .where(TodoItem.status != TodoStatus.COMPLETED)
-            .where(TodoItem.due_date <= upcoming)
-            .where(TodoItem.due_date >= now)
-            .order_by(TodoItem.due_date.asc())
-        )
-        todos = session.execute(stmt).scalars().all()
 
+def _claim_notifications(session: Session, rows: Sequence) -> set[int]:
+    """Insert ledger entries for ``rows`` and return the todo ids actually claimed.
+
+    Entries that already exist (e.g. claimed by an overlapping run) are skipped
+    so a reminder is sent at most once per ``(todo, due_date)``.
+    """
+
+    if not rows:
+        return set()
+    values = [{"todo_id": row.id, "due_date": row.due_date} for row in rows]
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        stmt = postgresql.insert(TodoNotification).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        stmt = sqlite.insert(TodoNotification).on_conflict_do_nothing()
+    else:  # pragma: no cover - other backends rely on the anti-join alone
+        session.execute(insert(TodoNotification), values)
+        return {row.id for row in rows}
+    claimed = session.execute(stmt.returning(TodoNotification.todo_id), values)
+    return set(claimed.scalars())
+
+
+def _send_reminders(session: Session, todos: Sequence) -> int:
+    """Claim ``todos`` in the ledger and notify the ones claimed; return the count.
+
+    In a real system this would integrate with an email/SMS service – here we
+    log a message per todo as a placeholder.
+    """
+
+    claimed = _claim_notifications(session, todos)
+    sent = 0
     for todo in todos:
+        if todo.id not in claimed:
+            continue
         logger.info(
             "[Reminder] Todo %s for user %s is due at %s. Triggering notification...",
             todo.title,
             todo.user_id,
             todo.due_date,
         )
+        sent += 1
+    return sent
+
+
+def _reminder_window() -> Tuple[datetime, datetime]:
+    window_start = datetime.utcnow()
+    return window_start, window_start + timedelta(hours=get_settings().reminder_lead_hours)
+
+
+def _iter_user_aligned_batches(
+    keys: Iterator[Sequence[int]], batch_size: int
+) -> Iterator[Tuple[TodoKey, TodoKey, int]]:
+    """Yield ``(first_key, last_key, size)`` ranges over keyset-ordered ``keys``.
+
+    A batch is closed once it holds at least ``batch_size`` rows and the next
+    row belongs to another user, so a user's reminders are never split across
+    workers unless that single user exceeds twice the batch size.
+    """
+
+    first: TodoKey | None = None
+    last: TodoKey | None = None
+    size = 0
+    for user_id, todo_id in keys:
+        if first is not None and last is not None and (
+            (size >= batch_size and user_id != last[0]) or size >= 2 * batch_size
+        ):
+            yield first, last, size
+            first, size = None, 0
+        if first is None:
+            first = (user_id, todo_id)
+        last = (user_id, todo_id)
+        size += 1
+    if first is not None and last is not None:
+        yield first, last, size
+
+
+@shared_task(name="backend.app.tasks.reminders.send_due_notifications", bind=True)
+def send_due_notifications(self) -> dict:  # type: ignore[no-untyped-def]
+    """Fan out notifications for not yet notified todos due within the lead time.
+
+    This full scan is a safety net next to the per-todo timer wheel and only
+    runs on a schedule when ``REMINDER_INTERVAL_MINUTES`` is positive.
+
+    The due rows are streamed as ``(user_id, id)`` keys in chunks of
+    ``REMINDER_BATCH_SIZE`` and split into user-aligned key ranges; each range
+    becomes a :func:`send_reminder_batch` subtask inside a chord whose callback
+    logs the run totals. Only the range bounds are kept in memory, so memory
+    use stays flat regardless of how many todos are due.
+    """
+
+    window_start, window_end = _reminder_window()
+
+    batches: List[Tuple[TodoKey, TodoKey]] = []
+    scanned = 0
+    with session_scope() as session:
+        stmt = _due_filter(
+            select(TodoItem.user_id, TodoItem.id), window_start, window_end
+        ).order_by(TodoItem.user_id, TodoItem.id)
+        result = session.execute(stmt.execution_options(yield_per=REMINDER_BATCH_SIZE))
+        rows = (row for partition in result.partitions() for row in partition)
+        for first, last, size in _iter_user_aligned_batches(rows, REMINDER_BATCH_SIZE):
+            batches.append((first, last))
+            scanned += size
+            if self.request.id:
+                self.update_state(
+                    state="PROGRESS", meta={"scanned": scanned, "batches": len(batches)}
+                )
+
+    if batches:
+        header = [
+            send_reminder_batch.s(
+                list(first), list(last), window_start.isoformat(), window_end.isoformat()
+            )
+            for first, last in batches
+        ]
+        chord(header)(summarize_reminder_batches.s(scanned=scanned))
+
+    logger.info(
+        "send_due_notifications dispatched %d todos in %d batches", scanned, len(batches)
+    )
+    return {"scanned": scanned, "batches": len(batches)}
+
+
+@shared_task(name="backend.app.tasks.reminders.send_reminder_batch")
+@query_budget(2)
+def send_reminder_batch(
+    first_key: List[int], last_key: List[int], window_start: str, window_end: str
+) -> int:
+    """Send reminders for due todos whose ``(user_id, id)`` lies in the given range.
+
+    Todos are claimed in the notification ledger before anything is sent, so
+    retries and overlapping beat runs never notify twice. Returns the number of
+    notifications triggered.
+    """
+
+    key = tuple_(TodoItem.user_id, TodoItem.id)
+    stmt = _due_filter(
+        select(TodoItem.id, TodoItem.title, TodoItem.user_id, TodoItem.due_date),
+        datetime.fromisoformat(window_start),
+        datetime.fromisoformat(window_end),
+    ).where(key.between(tuple_(*first_key), tuple_(*last_key)))
+
+    with session_scope() as session:
+        return _send_reminders(session, session.execute(stmt).all())
+
+
+@shared_task(name="backend.app.tasks.reminders.send_todo_reminders")
+@query_budget(2)
+def send_todo_reminders(todo_ids: List[int]) -> int:
+    """Send the reminders the dispatcher popped from the timer wheel.
+
+    Each todo is re-checked against the database, so todos completed,
+    deleted or moved to a later due date since they were scheduled are
+    skipped. Returns the number of notifications triggered.
+    """
+
+    window_start, window_end = _reminder_window()
+    stmt = _due_filter(
+        select(TodoItem.id, TodoItem.title, TodoItem.user_id, TodoItem.due_date),
+        window_start,
+        window_end,
+    ).where(TodoItem.id.in_(todo_ids))
+    with session_scope() as session:
+        return _send_reminders(session, session.execute(stmt).all())
+
+
+@shared_task(name="backend.app.tasks.reminders.schedule_pending_reminders")
+def schedule_pending_reminders() -> int:
+    """Add every open, not yet notified todo with a future due date to the timer wheel.
+
+    Run by the dispatcher on start-up so todos written before the wheel
+    existed, or while Redis was unavailable, still get their reminder.
+    Returns the number of todos scheduled.
+    """
+
+    scheduler = get_reminder_scheduler()
+    if not scheduler.enabled:
+        return 0
+    stmt = _due_filter(
+        select(TodoItem.id, TodoItem.status, TodoItem.due_date), datetime.utcnow(), datetime.max
+    )
+    scheduled = 0
+    with session_scope() as session:
+        result = session.execute(stmt.execution_options(yield_per=REMINDER_BATCH_SIZE))
+        for partition in result.partitions():
+            scheduler.schedule_sync(partition)
+            scheduled += len(partition)
+    logger.info("Scheduled reminders for %d pending todos", scheduled)
+    return scheduled
+
+
+@shared_task(name="backend.app.tasks.reminders.summarize_reminder_batches")
+def summarize_reminder_batches(sent_per_batch: List[int], *, scanned: int) -> dict:
+    """Chord callback logging the totals of a reminder run."""
 
-    logger.info("send_due_notifications processed %d todos", len(todos))
-    return len(todos)
+    totals = {"scanned": scanned, "sent": sum(sent_per_batch), "batches": len(sent_per_batch)}
+    logger.info(
+        "Reminder run finished: %(sent)d notifications from %(batches)d batches "
+        "(%(scanned)d todos scanned)",
+        totals,
+    )
+    return totals
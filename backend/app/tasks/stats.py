@@ -0,0 +1,111 @@
+"""Celery tasks keeping the per-user todo status counters accurate."""
+
+from __future__ import annotations
+
+import logging
+
+from celery import shared_task
+from sqlalchemy import and_, exists, func, literal, or_, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.sql.dml import Insert, Update
+
+from backend.app.db.session import session_scope
+from backend.app.models.stats import TodoStatusCount
+from backend.app.models.todo import TodoItem
+
+logger = logging.getLogger(__name__)
+
+
+def _drift_stmt():  # type: ignore[no-untyped-def]
+    """Select ``(user_id, status, count)`` for every counter that is wrong.
+
+    Covers counters that are missing or disagree with the todos, and counters
+    left non-zero for statuses no todo has any more.
+    """
+
+    actual = (
+        select(TodoItem.user_id, TodoItem.status, func.count().label("count"))
+        .group_by(TodoItem.user_id, TodoItem.status)
+        .subquery()
+    )
+    joined = and_(
+        TodoStatusCount.user_id == actual.c.user_id,
+        TodoStatusCount.status == actual.c.status,
+    )
+    wrong = (
+        select(actual.c.user_id, actual.c.status, actual.c.count)
+        .outerjoin(TodoStatusCount, joined)
+        .where(or_(TodoStatusCount.count.is_(None), TodoStatusCount.count != actual.c.count))
+    )
+    stale = (
+        select(TodoStatusCount.user_id, TodoStatusCount.status, literal(0).label("count"))
+        .outerjoin(actual, joined)
+        .where(actual.c.user_id.is_(None), TodoStatusCount.count != 0)
+    )
+    return union_all(wrong, stale)
+
+
+def _recount_stmt(dialect: str, user_id: int) -> Insert:
+    """Build one ``INSERT ... SELECT ... GROUP BY`` upsert of the user's counters.
+
+    The counts are computed by the statement itself, from the todos committed
+    when it runs, rather than carried over from an earlier query.
+    """
+
+    counts = (
+        select(TodoItem.user_id, TodoItem.status, func.count())
+        .where(TodoItem.user_id == user_id)
+        .group_by(TodoItem.user_id, TodoItem.status)
+    )
+    insert_ = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert_(TodoStatusCount).from_select(["user_id", "status", "count"], counts)
+    return stmt.on_conflict_do_update(
+        index_elements=[TodoStatusCount.user_id, TodoStatusCount.status],
+        set_={"count": stmt.excluded.count},
+        where=TodoStatusCount.count != stmt.excluded.count,
+    )
+
+
+def _clear_stale_stmt(user_id: int) -> Update:
+    """Zero the user's counters for statuses none of their todos has."""
+
+    has_todos = exists().where(
+        TodoItem.user_id == TodoStatusCount.user_id,
+        TodoItem.status == TodoStatusCount.status,
+    )
+    return (
+        update(TodoStatusCount)
+        .where(TodoStatusCount.user_id == user_id, TodoStatusCount.count != 0, ~has_todos)
+        .values(count=0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@shared_task(name="backend.app.tasks.stats.reconcile_todo_stats")
+def reconcile_todo_stats() -> int:
+    """Rewrite status counters that drifted from the todos they count.
+
+    Counters are updated in the same transaction as each write, so drift only
+    comes from writes that bypass the services (manual SQL, restores). Each
+    affected user is repaired in its own transaction: their counter rows are
+    locked first, so writes in flight commit before the counts are recomputed
+    and later ones wait, and a concurrent write is never overwritten with a
+    count that misses it. Returns the number of counters corrected.
+    """
+
+    with session_scope() as session:
+        drifted = session.execute(_drift_stmt()).all()
+    for user_id in sorted({user_id for user_id, _, _ in drifted}):
+        with session_scope() as session:
+            dialect = session.get_bind().dialect.name
+            session.execute(
+                select(TodoStatusCount.status)
+                .where(TodoStatusCount.user_id == user_id)
+                .order_by(TodoStatusCount.status)
+                .with_for_update()
+            )
+            session.execute(_recount_stmt(dialect, user_id))
+            session.execute(_clear_stale_stmt(user_id))
+    if drifted:
+        logger.warning("Corrected %d drifted todo status counters", len(drifted))
+    return len(drifted)
@@ -0,0 +1,31 @@
+"""Celery tasks maintaining the todo tombstone log."""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+
+from celery import shared_task
+from sqlalchemy import delete
+
+from backend.app.core.config import get_settings
+from backend.app.db.session import session_scope
+from backend.app.models.tombstone import TodoTombstone
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="backend.app.tasks.tombstones.prune_todo_tombstones")
+def prune_todo_tombstones() -> int:
+    """Delete tombstones older than the sync token retention period.
+
+    Clients holding older tokens are answered with ``410 Gone`` anyway, so
+    these rows can no longer be requested. Returns the number of rows removed.
+    """
+
+    cutoff = datetime.utcnow() - timedelta(days=get_settings().todo_tombstone_retention_days)
+    with session_scope() as session:
+        result = session.execute(delete(TodoTombstone).where(TodoTombstone.deleted_at < cutoff))
+        removed = result.rowcount or 0
+    logger.info("Pruned %d todo tombstones older than %s", removed, cutoff)
+    return removed
@@ -0,0 +1,132 @@
+"""Microbenchmark of the pure ASGI CSRF middleware against the previous
+``BaseHTTPMiddleware`` implementation.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.csrf_middleware --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import secrets
+import statistics
+import time
+from typing import Iterable, List, Set
+
+from fastapi import Request, status
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from backend.app.middleware.csrf import SAFE_METHODS, CSRFMiddleware
+
+HEADER_NAME = "X-CSRF-Token"
+COOKIE_NAME = "csrf_token"
+TOKEN = "benchmark-token"
+
+
+class LegacyCSRFMiddleware(BaseHTTPMiddleware):
+    """The ``BaseHTTPMiddleware`` implementation replaced by :class:`CSRFMiddleware`."""
+
+    def __init__(
+        self, app, *, header_name: str, cookie_name: str, exempt_paths: Iterable[str] | None = None
+    ) -> None:
+        super().__init__(app)
+        self.header_name = header_name
+        self.cookie_name = cookie_name
+        self.exempt_paths: Set[str] = {self._normalize(path) for path in (exempt_paths or [])}
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method.upper() in SAFE_METHODS:
+            return await call_next(request)
+        if self._normalize(request.url.path) in self.exempt_paths:
+            return await call_next(request)
+        csrf_cookie = request.cookies.get(self.cookie_name)
+        csrf_header = request.headers.get(self.header_name)
+        if not csrf_cookie or not csrf_header:
+            return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "CSRF token missing"})
+        if not secrets.compare_digest(csrf_cookie, csrf_header):
+            return JSONResponse(status_code=status.HTTP_403_FORBIDDEN, content={"detail": "CSRF token invalid"})
+        return await call_next(request)
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return path if path.startswith("/") else f"/{path}"
+
+
+async def _endpoint(scope, receive, send) -> None:  # type: ignore[no-untyped-def]
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def _scope(method: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": "/api/todos/",
+        "raw_path": b"/api/todos/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"cookie", f"{COOKIE_NAME}={TOKEN}; access_token=abc".encode()),
+            (HEADER_NAME.lower().encode(), TOKEN.encode()),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+
+def _receiver():  # type: ignore[no-untyped-def]
+    """Deliver an empty body once, then block like a client that stays connected."""
+
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> dict:
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    return receive
+
+
+async def _run(app, method: str, iterations: int) -> List[float]:  # type: ignore[no-untyped-def]
+    async def send(message: dict) -> None:
+        return None
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await app(_scope(method), _receiver(), send)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def bench(iterations: int) -> None:
+    options = {"header_name": HEADER_NAME, "cookie_name": COOKIE_NAME, "exempt_paths": ["/auth/login"]}
+    apps = {
+        "BaseHTTPMiddleware": LegacyCSRFMiddleware(_endpoint, **options),
+        "pure ASGI": CSRFMiddleware(_endpoint, **options),
+    }
+    for method in ("GET", "POST"):
+        for label, app in apps.items():
+            samples = await _run(app, method, iterations)
+            print(
+                f"{method:<5} {label:<20} mean={statistics.fmean(samples) * 1e6:7.1f}us "
+                f"median={statistics.median(samples) * 1e6:7.1f}us"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CSRF middleware microbenchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(bench(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
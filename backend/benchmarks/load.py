@@ -0,0 +1,490 @@
+"""Load test of the API routes with latency percentiles, throughput and allocations.
+
+Seeds users and todos (see :mod:`backend.benchmarks.seed`), then drives every
+scenario with ``--concurrency`` clients, each logged in as its own benchmark
+user. ``in-process`` mode calls :func:`create_app` through
+``httpx.ASGITransport`` and also samples per-request allocations with
+``tracemalloc``; ``uvicorn`` mode starts a server process and measures over
+TCP. Results can be compared against a JSON baseline::
+
+    python -m backend.benchmarks.load --mode both --baseline backend/benchmarks/baseline.json
+
+Without ``DATABASE_URL`` a temporary SQLite database is used; pass
+``--database-url`` to benchmark PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Metrics compared against the baseline and whether a higher value is worse.
+COMPARED_METRICS = {"p50_ms": True, "p95_ms": True, "rps": False, "alloc_peak_kib": True}
+
+RequestSpec = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass
+class Worker:
+    """One benchmark client with its own session cookies and todos."""
+
+    client: Any
+    email: str
+    rng: random.Random
+    todo_ids: List[int] = field(default_factory=list)
+    state: Dict[str, Any] = field(default_factory=dict)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        if method != "GET":
+            headers = kwargs.setdefault("headers", {})
+            csrf = self.client.cookies.get("csrf_token")
+            if csrf:
+                headers["X-CSRF-Token"] = csrf
+        return await self.client.request(method, url, **kwargs)
+
+    def todo_id(self) -> int:
+        return self.rng.choice(self.todo_ids)
+
+
+def _todo_json(worker: Worker) -> Dict[str, Any]:
+    due_date = datetime.utcnow() + timedelta(hours=worker.rng.uniform(1, 240))
+    return {"title": f"Load test {worker.rng.random():.6f}", "due_date": due_date.isoformat()}
+
+
+async def _login(worker: Worker) -> RequestSpec:
+    from backend.benchmarks.seed import PASSWORD
+
+    return "POST", "/api/auth/login", {"json": {"email": worker.email, "password": PASSWORD}}
+
+
+async def _refresh(worker: Worker) -> RequestSpec:
+    return "POST", "/api/auth/refresh", {}
+
+
+async def _list(worker: Worker) -> RequestSpec:
+    return "GET", "/api/todos/?limit=20", {}
+
+
+async def _list_status(worker: Worker) -> RequestSpec:
+    status = worker.rng.choice(["pending", "in_progress", "completed"])
+    return "GET", f"/api/todos/?status={status}&limit=20", {}
+
+
+async def _list_cursor(worker: Worker) -> RequestSpec:
+    cursor = worker.state.get("cursor")
+    if cursor is None:
+        response = await worker.request("GET", "/api/todos/?limit=20")
+        cursor = worker.state["cursor"] = response.headers.get("x-next-cursor", "")
+    return "GET", "/api/todos/", {"params": {"limit": 20, "cursor": cursor}}
+
+
+async def _list_fields(worker: Worker) -> RequestSpec:
+    return "GET", "/api/todos/?limit=100&fields=id,title,status,due_date", {}
+
+
+async def _due_soon(worker: Worker) -> RequestSpec:
+    return "GET", "/api/todos/due-soon?hours=48", {}
+
+
+async def _search(worker: Worker) -> RequestSpec:
+    from backend.benchmarks.seed import _WORDS
+
+    return "GET", "/api/todos/search", {"params": {"q": worker.rng.choice(_WORDS)}}
+
+
+async def _stats(worker: Worker) -> RequestSpec:
+    return "GET", "/api/todos/stats", {}
+
+
+async def _changes(worker: Worker) -> RequestSpec:
+    return "GET", "/api/todos/changes?limit=100", {}
+
+
+async def _get(worker: Worker) -> RequestSpec:
+    return "GET", f"/api/todos/{worker.todo_id()}", {}
+
+
+async def _create(worker: Worker) -> RequestSpec:
+    return "POST", "/api/todos/", {"json": _todo_json(worker)}
+
+
+async def _update(worker: Worker) -> RequestSpec:
+    payload = {"title": f"Updated {worker.rng.random():.6f}"}
+    return "PUT", f"/api/todos/{worker.todo_id()}", {"json": payload}
+
+
+async def _delete(worker: Worker) -> RequestSpec:
+    # The todo to delete is created outside the timed request.
+    response = await worker.request("POST", "/api/todos/", json=_todo_json(worker))
+    return "DELETE", f"/api/todos/{response.json()['id']}", {}
+
+
+async def _batch_create(worker: Worker) -> RequestSpec:
+    items = [_todo_json(worker) for _ in range(20)]
+    return "POST", "/api/todos/batch", {"json": {"items": items}}
+
+
+# Reads run before writes so they see the seeded data set.
+SCENARIOS: Dict[str, Callable[[Worker], Awaitable[RequestSpec]]] = {
+    "login": _login,
+    "refresh": _refresh,
+    "list": _list,
+    "list-status": _list_status,
+    "list-cursor": _list_cursor,
+    "list-fields": _list_fields,
+    "due-soon": _due_soon,
+    "search": _search,
+    "stats": _stats,
+    "changes": _changes,
+    "get": _get,
+    "create": _create,
+    "update": _update,
+    "delete": _delete,
+    "batch-create": _batch_create,
+}
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(samples: List[float], wall: float, errors: int) -> Dict[str, Any]:
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "p50_ms": _percentile(samples, 50) * 1e3,
+        "p95_ms": _percentile(samples, 95) * 1e3,
+        "p99_ms": _percentile(samples, 99) * 1e3,
+        "rps": len(samples) / wall if wall else 0.0,
+    }
+
+
+async def _open_workers(
+    make_client: Callable[[], Any], emails: List[str], concurrency: int
+) -> List[Worker]:
+    from backend.benchmarks.seed import PASSWORD
+
+    workers = []
+    for index in range(concurrency):
+        email = emails[index % len(emails)]
+        worker = Worker(make_client(), email, random.Random(index))
+        response = await worker.request(
+            "POST", "/api/auth/login", json={"email": email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        response = await worker.request("GET", "/api/todos/?limit=100&fields=id")
+        response.raise_for_status()
+        worker.todo_ids = [todo["id"] for todo in response.json()]
+        workers.append(worker)
+    return workers
+
+
+async def _run_scenario(
+    workers: List[Worker], scenario: Callable[[Worker], Awaitable[RequestSpec]], requests: int
+) -> Tuple[List[float], float, int]:
+    samples: List[float] = []
+    errors = 0
+    per_worker = max(1, requests // len(workers))
+
+    async def drive(worker: Worker) -> None:
+        nonlocal errors
+        for _ in range(per_worker):
+            method, url, kwargs = await scenario(worker)
+            start = time.perf_counter()
+            response = await worker.request(method, url, **kwargs)
+            samples.append(time.perf_counter() - start)
+            errors += response.is_error
+
+    # One untimed request per worker warms caches and connections.
+    for worker in workers:
+        method, url, kwargs = await scenario(worker)
+        await worker.request(method, url, **kwargs)
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(worker) for worker in workers))
+    return samples, time.perf_counter() - start, errors
+
+
+async def _sample_allocations(
+    worker: Worker, scenario: Callable[[Worker], Awaitable[RequestSpec]], count: int
+) -> float:
+    """Return the mean peak traced memory of one request, in KiB."""
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(count):
+            method, url, kwargs = await scenario(worker)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await worker.request(method, url, **kwargs)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks) / 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def _uvicorn_server(workers: int) -> AsyncIterator[str]:
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+        "--timeout-graceful-shutdown", "5",
+    ]
+    process = subprocess.Popen(command, env=os.environ.copy())
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            if process.poll() is not None:
+                raise SystemExit(f"uvicorn exited with code {process.returncode}")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise SystemExit("uvicorn did not start within 60s")
+                await asyncio.sleep(0.2)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def bench_http(
+    mode: str, emails: List[str], names: List[str], args: argparse.Namespace
+) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    results: Dict[str, Dict[str, Any]] = {}
+
+    @asynccontextmanager
+    async def client_factory() -> AsyncIterator[Callable[[], Any]]:
+        if mode == "in-process":
+            from backend.app.main import create_app
+
+            transport = httpx.ASGITransport(app=create_app())
+            yield lambda: httpx.AsyncClient(transport=transport, base_url="http://bench")
+        else:
+            async with _uvicorn_server(args.uvicorn_workers) as base_url:
+                limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+                yield lambda: httpx.AsyncClient(base_url=base_url, limits=limits)
+
+    async with client_factory() as make_client:
+        workers = await _open_workers(make_client, emails, args.concurrency)
+        try:
+            for name in names:
+                scenario = SCENARIOS[name]
+                samples, wall, errors = await _run_scenario(workers, scenario, args.requests)
+                result = _summarize(samples, wall, errors)
+                if mode == "in-process" and args.alloc_samples:
+                    result["alloc_peak_kib"] = await _sample_allocations(
+                        workers[0], scenario, args.alloc_samples
+                    )
+                results[f"{mode}/{name}"] = result
+                _print_result(f"{mode}/{name}", result)
+        finally:
+            for worker in workers:
+                await worker.client.aclose()
+    if mode == "in-process":
+        from backend.app.db.session import async_engine
+
+        # ASGITransport does not run the lifespan, so release pooled connections here.
+        await async_engine.dispose()
+    return results
+
+
+def bench_reminders(runs: int) -> Dict[str, Dict[str, Any]]:
+    """Time the reminder tasks, executed eagerly in this process.
+
+    ``reminder-scan`` is the full-table scan with its chord of batches;
+    ``reminder-dispatch`` is one :func:`send_todo_reminders` call for every
+    todo the scan would notify, as handed over by the dispatcher.
+    """
+
+    from sqlalchemy import delete, select
+
+    from backend.app.celery_app import celery_app
+    from backend.app.db.session import session_scope
+    from backend.app.models.notification import TodoNotification
+    from backend.app.models.todo import TodoItem
+    from backend.app.tasks.reminders import (
+        _due_filter,
+        _reminder_window,
+        send_due_notifications,
+        send_todo_reminders,
+    )
+
+    celery_app.conf.task_always_eager = True
+    # Chords need a result backend; keep results in memory for the benchmark.
+    celery_app.conf.result_backend = "cache+memory://"
+    with session_scope() as session:
+        due_ids = list(session.scalars(_due_filter(select(TodoItem.id), *_reminder_window())))
+
+    tasks = {
+        "task/reminder-scan": lambda: send_due_notifications.apply().get(),
+        "task/reminder-dispatch": lambda: send_todo_reminders.apply((due_ids,)).get(),
+    }
+    results = {}
+    for key, run in tasks.items():
+        samples = []
+        for _ in range(runs):
+            with session_scope() as session:
+                # Forget earlier runs so every run sends the same reminders.
+                session.execute(delete(TodoNotification))
+            start = time.perf_counter()
+            run()
+            samples.append(time.perf_counter() - start)
+        results[key] = _summarize(samples, sum(samples), 0)
+        _print_result(key, results[key])
+    return results
+
+
+def _print_result(key: str, result: Dict[str, Any]) -> None:
+    alloc = result.get("alloc_peak_kib")
+    print(
+        f"{key:<28} p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+        f"p99={result['p99_ms']:8.2f}ms rps={result['rps']:8.1f} errors={result['errors']}"
+        + (f" alloc={alloc:8.1f}KiB" if alloc is not None else "")
+    )
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], default_threshold: float
+) -> List[str]:
+    """Return a description of every metric that regressed beyond its threshold.
+
+    Thresholds are relative and looked up by result key, then by scenario
+    name, then ``"default"`` in the baseline's ``thresholds`` mapping.
+    """
+
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for key, current in results.items():
+        expected = baseline.get("results", {}).get(key)
+        if expected is None:
+            continue
+        scenario = key.split("/", 1)[1]
+        limit = thresholds.get(key, thresholds.get(scenario, thresholds.get("default", default_threshold)))
+        for metric, higher_is_worse in COMPARED_METRICS.items():
+            if metric not in current or not expected.get(metric):
+                continue
+            change = current[metric] / expected[metric] - 1
+            if (change if higher_is_worse else -change) > limit:
+                regressions.append(
+                    f"{key} {metric}: {expected[metric]:.2f} -> {current[metric]:.2f} "
+                    f"({change:+.0%}, limit {limit:.0%})"
+                )
+    return regressions
+
+
+async def _bench(args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from backend.benchmarks.seed import bench_email, migrate, seed
+
+    migrate()
+    await asyncio.to_thread(seed, args.users, args.todos_per_user)
+    emails = [bench_email(index) for index in range(args.users)]
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = sorted(set(names) - set(SCENARIOS) - {"reminders"})
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(unknown)}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    modes = ["in-process", "uvicorn"] if args.mode == "both" else [args.mode]
+    http_names = [name for name in names if name in SCENARIOS]
+    for mode in modes:
+        results.update(await bench_http(mode, emails, http_names, args))
+    if args.reminder_runs and (not args.scenarios or "reminders" in names):
+        # Not in a thread: Celery's current app is thread-local.
+        results.update(bench_reminders(args.reminder_runs))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--mode", choices=("in-process", "uvicorn", "both"), default="in-process")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--uvicorn-workers", type=int, default=1)
+    parser.add_argument(
+        "--scenarios", help="comma-separated subset, 'reminders' for the tasks (default: all)"
+    )
+    parser.add_argument("--alloc-samples", type=int, default=20)
+    parser.add_argument("--reminder-runs", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against this baseline file")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store the results as the new baseline"
+    )
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The engines are configured from the environment at import time.
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp}/bench.db"
+        # Every client logs in over and over from one address; measure, don't throttle.
+        os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+        results = asyncio.run(_bench(args))
+
+    config = {
+        key: getattr(args, key)
+        for key in ("users", "todos_per_user", "requests", "concurrency", "uvicorn_workers")
+    }
+    config["dialect"] = os.environ["DATABASE_URL"].split(":", 1)[0].split("+", 1)[0]
+    if args.json:
+        args.json.write_text(json.dumps({"config": config, "results": results}, indent=2) + "\n")
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.update_baseline:
+        thresholds = {"default": args.max_regression}
+        if baseline_path.exists():
+            thresholds = json.loads(baseline_path.read_text()).get("thresholds", thresholds)
+        document = {"config": config, "thresholds": thresholds, "results": results}
+        baseline_path.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {baseline_path}")
+    elif args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != config:
+            print(f"warning: baseline was recorded with {baseline.get('config')}, not {config}")
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+        print("no regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Per-request overhead of the Prometheus middleware and the cost of a scrape.
+
+Runs a trivial ASGI endpoint bare and wrapped in :class:`MetricsMiddleware`
+and fails when the median overhead exceeds ``--budget-us``. Run from the
+repository root::
+
+    python -m backend.benchmarks.metrics --iterations 20000 --budget-us 25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import List
+
+ROUTES = [SimpleNamespace(path=f"/api/todos/{{todo_id}}/bench{index}") for index in range(20)]
+
+
+async def _endpoint(scope, receive, send) -> None:  # type: ignore[no-untyped-def]
+    # The router stores the matched route in the scope, as FastAPI does.
+    scope["route"] = ROUTES[scope["bench_index"] % len(ROUTES)]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def _receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message: dict) -> None:
+    return None
+
+
+async def _run(app, iterations: int) -> List[float]:  # type: ignore[no-untyped-def]
+    samples = []
+    for index in range(iterations):
+        scope = {"type": "http", "method": "GET", "path": "/api/todos/1", "bench_index": index}
+        start = time.perf_counter()
+        await app(scope, _receive, _send)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_scrape(iterations: int) -> float:
+    from backend.app.core.prometheus import render_metrics
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        render_metrics()
+    return (time.perf_counter() - start) / iterations
+
+
+async def bench(iterations: int) -> float:
+    from backend.app.middleware.metrics import MetricsMiddleware
+
+    instrumented = MetricsMiddleware(_endpoint)
+    # Warm up the label caches so the steady state is measured.
+    await _run(instrumented, len(ROUTES))
+    results = {}
+    for label, app in (("bare endpoint", _endpoint), ("MetricsMiddleware", instrumented)):
+        samples = await _run(app, iterations)
+        results[label] = statistics.median(samples)
+        print(
+            f"{label:<20} mean={statistics.fmean(samples) * 1e6:7.1f}us "
+            f"median={results[label] * 1e6:7.1f}us"
+        )
+    overhead = results["MetricsMiddleware"] - results["bare endpoint"]
+    print(f"{'overhead':<20} median={overhead * 1e6:7.1f}us")
+    return overhead
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prometheus middleware overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=25.0)
+    parser.add_argument("--scrapes", type=int, default=200)
+    args = parser.parse_args()
+
+    overhead = asyncio.run(bench(args.iterations))
+    print(f"{'scrape':<20} mean={bench_scrape(args.scrapes) * 1e3:7.2f}ms")
+    if overhead * 1e6 > args.budget_us:
+        print(f"overhead exceeds the budget of {args.budget_us:.1f}us", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
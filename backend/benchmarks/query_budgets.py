@@ -0,0 +1,200 @@
+"""Check the declared SQL query budgets of the API routes.
+
+Seeds a database (see :mod:`backend.benchmarks.seed`), drives every budgeted
+route once through :func:`create_app` with ``QUERY_BUDGET_MODE=raise`` and
+fails when any request is answered with an error; a ``500`` means it ran
+more statements than its ``@query_budget``. It first checks the counter itself:
+nesting, ``executemany`` counted once, :func:`assert_max_queries` and a
+violation turning the response into a ``500``. Run from the repository root::
+
+    python -m backend.benchmarks.query_budgets --batch-size 50
+
+Without ``DATABASE_URL`` a temporary SQLite database is used; pass
+``--database-url`` to check PostgreSQL. ``/api/todos/stream`` never finishes
+its response and is not driven here.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple
+
+
+def _json(response: Any) -> Dict[str, Any]:
+    try:
+        return response.json()
+    except ValueError:
+        return {}
+
+
+def check_counter() -> List[str]:
+    """Exercise the counter, ``assert_max_queries`` and the middleware directly."""
+
+    from sqlalchemy import insert, select, text
+
+    from backend.app.db.query_counter import (
+        QueryBudgetExceeded,
+        assert_max_queries,
+        count_queries,
+        query_budget,
+    )
+    from backend.app.db.session import engine
+    from backend.app.middleware.query_budget import QueryBudgetMiddleware
+    from backend.app.models.user import User
+
+    failures = []
+    with engine.connect() as conn:
+        with count_queries("outer") as outer:
+            conn.execute(text("SELECT 1"))
+            with count_queries("inner") as inner:
+                conn.execute(text("SELECT 1"))
+                conn.execute(
+                    insert(User).returning(User.id),
+                    [{"email": f"c{i}@example.com", "hashed_password": "x"} for i in range(5)],
+                )
+        conn.rollback()
+    if (outer.count, inner.count) != (3, 2):
+        failures.append(f"nested counters saw {outer.count}/{inner.count} statements, expected 3/2")
+
+    try:
+        with engine.connect() as conn, assert_max_queries(1):
+            conn.execute(select(User.id).limit(1))
+            conn.execute(select(User.id).limit(1))
+    except QueryBudgetExceeded:
+        pass
+    else:
+        failures.append("assert_max_queries(1) accepted two statements")
+
+    @query_budget(0)
+    def endpoint() -> None: ...
+
+    async def app(scope, receive, send) -> None:  # type: ignore[no-untyped-def]
+        scope["route"] = SimpleNamespace(path="/over-budget", endpoint=endpoint)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    sent: List[Dict[str, Any]] = []
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        sent.append(message)
+
+    middleware = QueryBudgetMiddleware(app, mode="raise")
+    scope = {"type": "http", "method": "GET", "path": "/over-budget"}
+    try:
+        asyncio.run(middleware(scope, receive, send))
+    except QueryBudgetExceeded:
+        if sent:
+            failures.append("the response started before the budget was checked")
+    else:
+        failures.append("a request over its budget passed in raise mode")
+    return failures
+
+
+async def check_routes(email: str, password: str, batch_size: int) -> List[str]:
+    import httpx
+
+    from backend.app.db.session import async_engine
+    from backend.app.main import create_app
+    from backend.app.services.user_cache import get_user_cache
+
+    transport = httpx.ASGITransport(app=create_app(), raise_app_exceptions=False)
+    failures = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://budgets") as client:
+
+        async def call(method: str, url: str, **kwargs: Any) -> httpx.Response:
+            if method != "GET" and client.cookies.get("csrf_token"):
+                kwargs.setdefault("headers", {})["X-CSRF-Token"] = client.cookies["csrf_token"]
+            response = await client.request(method, url, **kwargs)
+            # Budget violations are 500s; any other error means the route was not exercised.
+            failed = response.status_code >= 400
+            print(f"{'FAIL' if failed else 'ok':<4} {response.status_code} {method} {url}")
+            if failed:
+                failures.append(f"{method} {url} answered {response.status_code}: {response.text}")
+            return response
+
+        due = (datetime.utcnow() + timedelta(days=2)).isoformat()
+        register = {"email": "budgets@example.com", "password": password}
+        await call("POST", "/api/auth/register", json=register)
+        login = await call("POST", "/api/auth/login", json={"email": email, "password": password})
+        user_id = _json(login).get("id", 0)
+        await call("POST", "/api/auth/refresh")
+        created = await call("POST", "/api/todos/", json={"title": "Budget", "due_date": due})
+        todo_id = _json(created).get("id", 0)
+        batch = await call(
+            "POST",
+            "/api/todos/batch",
+            json={"items": [{"title": f"Batch {i}", "due_date": due} for i in range(batch_size)]},
+        )
+        ids = [result["id"] for result in _json(batch).get("results", [])]
+        # Three distinct sets of changed fields, one of them ``updated_at`` only.
+        updates: List[Dict[str, Any]] = [{"id": todo_id, "status": "completed"}]
+        for item in ids[:-1]:
+            changes = {"title": f"Renamed {item}"} if item % 2 else {"status": "completed"}
+            updates.append({"id": item, **changes})
+        updates += [{"id": item} for item in ids[-1:]]
+        await call("PATCH", "/api/todos/batch", json={"items": updates})
+        requests: List[Tuple[str, str, Dict[str, Any]]] = [
+            ("GET", "/api/todos/", {}),
+            ("GET", "/api/todos/?fields=id,title", {}),
+            ("GET", "/api/todos/search?q=batch", {}),
+            ("GET", "/api/todos/due-soon", {}),
+            ("GET", "/api/todos/stats", {}),
+            ("GET", "/api/todos/changes", {}),
+            ("GET", f"/api/todos/{todo_id}", {}),
+            ("PUT", f"/api/todos/{todo_id}", {"json": {"title": "Updated"}}),
+            ("DELETE", "/api/todos/batch", {"json": {"ids": ids + [0]}}),
+            ("DELETE", f"/api/todos/{todo_id}", {}),
+            ("POST", "/api/auth/logout", {}),
+        ]
+        for method, url, kwargs in requests:
+            if method == "PUT":
+                # The costliest update: status change with the user loaded from the database.
+                get_user_cache().invalidate(user_id)
+                await call(method, url, json={"status": "in_progress"})
+            await call(method, url, **kwargs)
+        await call("POST", "/api/auth/login", json={"email": email, "password": password})
+        await call("POST", "/api/auth/logout-all")
+    # ASGITransport does not run the lifespan, so release pooled connections here.
+    await async_engine.dispose()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--todos-per-user", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The engines and settings are configured from the environment at import time.
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{tmp}/budgets.db"
+        os.environ["QUERY_BUDGET_MODE"] = "raise"
+        os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+
+        from backend.benchmarks.seed import PASSWORD, bench_email, migrate, seed
+
+        migrate()
+        seed(1, args.todos_per_user)
+        failures = check_counter()
+        failures += asyncio.run(check_routes(bench_email(0), PASSWORD, args.batch_size))
+
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
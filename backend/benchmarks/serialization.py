@@ -0,0 +1,92 @@
+"""Compare per-page serialization time of ``List[TodoRead]`` responses.
+
+"before" is FastAPI's default path for a ``response_model``: validate each ORM
+row into ``TodoRead``, run ``jsonable_encoder`` and dump with the stdlib
+``json`` module. "after" is :func:`backend.app.core.serialization.dump_json`.
+Run from the repository root::
+
+    python -m backend.benchmarks.serialization --page-size 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+
+def _make_page(size: int) -> list:
+    from backend.app.models.todo import TodoItem, TodoStatus
+    from backend.app.models.user import User  # noqa: F401 - resolves the relationship
+
+    now = datetime.utcnow()
+    return [
+        TodoItem(
+            id=index,
+            title=f"Todo {index}",
+            description="Lorem ipsum dolor sit amet. " * 4,
+            status=TodoStatus.PENDING,
+            due_date=now + timedelta(hours=index),
+            created_at=now,
+            updated_at=now,
+            user_id=1,
+        )
+        for index in range(size)
+    ]
+
+
+def _default_path(todos: list) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+
+    from backend.app.schemas.todo import TodoRead
+
+    if hasattr(TodoRead, "model_validate"):
+        items = [TodoRead.model_validate(todo, from_attributes=True) for todo in todos]
+    else:
+        items = [TodoRead.from_orm(todo) for todo in todos]
+    content = jsonable_encoder(items)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _fast_path(todos: list) -> bytes:
+    from backend.app.core.serialization import dump_json
+    from backend.app.schemas.todo import TodoRead
+
+    return dump_json(List[TodoRead], todos)
+
+
+def _measure(label: str, render: Callable[[list], bytes], todos: list, iterations: int) -> float:
+    render(todos)  # warm up caches (adapter construction, imports)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render(todos)
+        samples.append(time.perf_counter() - start)
+    mean = statistics.fmean(samples)
+    print(
+        f"{label:<8} mean={mean * 1e3:7.3f}ms "
+        f"median={statistics.median(samples) * 1e3:7.3f}ms "
+        f"per-row={mean / len(todos) * 1e6:6.2f}us"
+    )
+    return mean
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    todos = _make_page(args.page_size)
+    if json.loads(_default_path(todos)) != json.loads(_fast_path(todos)):
+        raise SystemExit("fast path output differs from the default path")
+    before = _measure("before", _default_path, todos, args.iterations)
+    after = _measure("after", _fast_path, todos, args.iterations)
+    print(f"speed-up x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Compare authenticated request latency with and without the token cache.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.token_cache --requests 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _report(label: str, samples: List[float]) -> None:
+    print(
+        f"{label:<28} mean={statistics.fmean(samples) * 1e6:8.1f}us "
+        f"p50={_percentile(samples, 50) * 1e6:8.1f}us "
+        f"p99={_percentile(samples, 99) * 1e6:8.1f}us"
+    )
+
+
+def bench_decode(iterations: int) -> None:
+    from backend.app.core.security import create_access_token, decode_token, get_token_cache
+
+    cache = get_token_cache()
+    token = create_access_token(1)
+    for enabled in (False, True):
+        cache.clear()
+        cache.enabled = enabled
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            decode_token(token)
+            samples.append(time.perf_counter() - start)
+        _report(f"decode_token cache={'on' if enabled else 'off'}", samples)
+
+
+async def bench_requests(requests: int) -> None:
+    import httpx
+
+    from backend.app.core.security import get_token_cache
+    from backend.app.db.session import async_engine, engine
+    from backend.app.main import create_app
+    from backend.app.models import Base
+
+    Base.metadata.create_all(engine)
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post(
+            "/api/auth/register",
+            json={"email": "bench@example.com", "password": "bench-password"},
+        )
+        response.raise_for_status()
+        cache = get_token_cache()
+        for enabled in (False, True):
+            cache.clear()
+            cache.enabled = enabled
+            samples = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.get("/api/todos/due-soon")
+                samples.append(time.perf_counter() - start)
+                response.raise_for_status()
+            _report(f"GET /todos/due-soon cache={'on' if enabled else 'off'}", samples)
+        print("token cache stats:", cache.stats())
+    # ASGITransport does not run the lifespan, so release pooled connections here.
+    await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--decode-iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    bench_decode(args.decode_iterations)
+    asyncio.run(bench_requests(args.requests))
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        # The engine is configured from the environment at import time.
+        os.environ.setdefault("DATABASE_URL", f"sqlite:///{tmp}/bench.db")
+        main()
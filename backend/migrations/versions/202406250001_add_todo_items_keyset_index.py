@@ -0,0 +1,26 @@
+"""Add composite index backing keyset pagination of todo items.
+
+Revision ID: 202406250001
+Revises: 202406180001
+Create Date: 2024-06-25 00:01:00.000000
+"""
+
+from alembic import op
+
+revision = "202406250001"
+down_revision = "202406180001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_todo_items_user_created_id",
+        "todo_items",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_user_created_id", table_name="todo_items")
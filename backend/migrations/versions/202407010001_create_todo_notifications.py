@@ -0,0 +1,41 @@
+"""Create the reminder notification ledger.
+
+Revision ID: 202407010001
+Revises: 202406250001
+Create Date: 2024-07-01 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202407010001"
+down_revision = "202406250001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "todo_id",
+            sa.Integer(),
+            sa.ForeignKey("todo_items.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("due_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "sent_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.UniqueConstraint("todo_id", "due_date", name="uq_todo_notifications_todo_due"),
+    )
+    op.create_index(op.f("ix_todo_items_due_date"), "todo_items", ["due_date"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_todo_items_due_date"), table_name="todo_items")
+    op.drop_table("todo_notifications")
@@ -0,0 +1,53 @@
+"""Add todo tombstones and the index backing delta sync.
+
+Revision ID: 202407080001
+Revises: 202407010001
+Create Date: 2024-07-08 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202407080001"
+down_revision = "202407010001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "todo_tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("todo_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    op.create_index(
+        "ix_todo_tombstones_user_id_id", "todo_tombstones", ["user_id", "id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_todo_tombstones_deleted_at"), "todo_tombstones", ["deleted_at"], unique=False
+    )
+    op.create_index(
+        "ix_todo_items_user_updated_id",
+        "todo_items",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_user_updated_id", table_name="todo_items")
+    op.drop_index(op.f("ix_todo_tombstones_deleted_at"), table_name="todo_tombstones")
+    op.drop_index("ix_todo_tombstones_user_id_id", table_name="todo_tombstones")
+    op.drop_table("todo_tombstones")
@@ -0,0 +1,83 @@
+"""Add the full-text search index over todo titles and descriptions.
+
+PostgreSQL gets a generated ``tsvector`` column with a GIN index. SQLite gets
+an external-content FTS5 table kept in sync by triggers.
+
+Revision ID: 202407150001
+Revises: 202407080001
+Create Date: 2024-07-15 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "202407150001"
+down_revision = "202407080001"
+branch_labels = None
+depends_on = None
+
+_SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER todo_items_fts_insert AFTER INSERT ON todo_items BEGIN
+        INSERT INTO todo_items_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_items_fts_delete AFTER DELETE ON todo_items BEGIN
+        INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_items_fts_update AFTER UPDATE OF title, description ON todo_items BEGIN
+        INSERT INTO todo_items_fts(todo_items_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todo_items_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.add_column(
+            "todo_items",
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(
+                    "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+                    persisted=True,
+                ),
+            ),
+        )
+        op.create_index(
+            "ix_todo_items_search_vector",
+            "todo_items",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE todo_items_fts USING fts5("
+            "title, description, content='todo_items', content_rowid='id')"
+        )
+        for trigger in _SQLITE_TRIGGERS:
+            op.execute(trigger)
+        op.execute("INSERT INTO todo_items_fts(todo_items_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.drop_index("ix_todo_items_search_vector", table_name="todo_items")
+        op.drop_column("todo_items", "search_vector")
+    elif dialect == "sqlite":
+        for name in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS todo_items_fts_{name}")
+        op.execute("DROP TABLE IF EXISTS todo_items_fts")
@@ -0,0 +1,45 @@
+"""Create per-user todo status counters backing the statistics endpoint.
+
+Revision ID: 202407220001
+Revises: 202407150001
+Create Date: 2024-07-22 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "202407220001"
+down_revision = "202407150001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The ``todo_status`` type already exists for ``todo_items.status``.
+    todo_status_enum = postgresql.ENUM(
+        "pending", "in_progress", "completed", name="todo_status", create_type=False
+    )
+    op.create_table(
+        "todo_status_counts",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("status", todo_status_enum, primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "INSERT INTO todo_status_counts (user_id, status, count) "
+        "SELECT user_id, status, COUNT(*) FROM todo_items GROUP BY user_id, status"
+    )
+    op.create_index(
+        "ix_todo_items_user_due_date", "todo_items", ["user_id", "due_date"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_todo_items_user_due_date", table_name="todo_items")
+    op.drop_table("todo_status_counts")
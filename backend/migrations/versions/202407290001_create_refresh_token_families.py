@@ -0,0 +1,55 @@
+"""Create the refresh token families of the SQL refresh token store.
+
+Revision ID: 202407290001
+Revises: 202407220001
+Create Date: 2024-07-29 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202407290001"
+down_revision = "202407220001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refresh_token_families",
+        sa.Column("id", sa.String(length=32), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        op.f("ix_refresh_token_families_user_id"),
+        "refresh_token_families",
+        ["user_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_refresh_token_families_expires_at"),
+        "refresh_token_families",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_refresh_token_families_expires_at"), table_name="refresh_token_families"
+    )
+    op.drop_index(op.f("ix_refresh_token_families_user_id"), table_name="refresh_token_families")
+    op.drop_table("refresh_token_families")
@@ -0,0 +1,30 @@
+"""Remember the replaced refresh token of each family for the reuse grace window.
+
+Revision ID: 202408050001
+Revises: 202407290001
+Create Date: 2024-08-05 00:01:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "202408050001"
+down_revision = "202407290001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "refresh_token_families", sa.Column("previous_jti", sa.String(length=32), nullable=True)
+    )
+    op.add_column(
+        "refresh_token_families",
+        sa.Column("rotated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("refresh_token_families") as batch_op:
+        batch_op.drop_column("rotated_at")
+        batch_op.drop_column("previous_jti")